@@ -1,10 +1,27 @@
 from django.contrib import admin
 from .models import Interface, UserInterfaceAccess
+from .services import get_interfaces
 from exams.models import Course, Exam, Question, UserExam, ExamSession
 
+class InterfaceListFilter(admin.SimpleListFilter):
+    """Interface filter built from the cached interface list instead of a DISTINCT scan."""
+    title = 'interface'
+    parameter_name = 'interface'
+
+    def lookups(self, request, model_admin):
+        return [
+            (interface['interface_id'], f"{interface['module_name']} - {interface['function']}")
+            for interface in get_interfaces()
+        ]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(interface_id=self.value())
+        return queryset
+
 @admin.register(Interface)
 class InterfaceAdmin(admin.ModelAdmin):
-    list_display = ('interface_id', 'module_name', 'function', 'url', 'created_at')
+    list_display = ('interface_id', 'display_name', 'url', 'created_at')
     list_filter = ('created_at',)
     search_fields = ('module_name', 'function', 'url')
     ordering = ('-created_at',)
@@ -12,6 +29,22 @@ class InterfaceAdmin(admin.ModelAdmin):
 @admin.register(UserInterfaceAccess)
 class UserInterfaceAccessAdmin(admin.ModelAdmin):
     list_display = ('access_id', 'user', 'interface', 'has_access', 'granted_date')
-    list_filter = ('has_access', 'granted_date', 'interface')
-    search_fields = ('user__name', 'interface__module_name')
+    list_filter = ('has_access', 'granted_date', InterfaceListFilter)
+    # Search the denormalized name columns so the lookup stays on one table
+    search_fields = ('user_name_cache', 'interface_module_cache')
     ordering = ('-granted_date',)
+    list_select_related = ('user', 'interface')
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        # Trim the changelist to the columns list_display and __str__ read (the
+        # delete-selected action reuses it); the change, delete and history
+        # views load whole rows
+        match = request.resolver_match
+        if match is not None and match.url_name == f'{self.opts.app_label}_{self.opts.model_name}_changelist':
+            queryset = queryset.select_related('user', 'interface').only(
+                'access_id', 'has_access', 'granted_date', 'user_name_cache', 'interface_module_cache',
+                'user__name', 'user__national_id',
+                'interface__interface_id', 'interface__module_name', 'interface__display_name',
+            )
+        return queryset
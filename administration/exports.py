@@ -0,0 +1,444 @@
+import io
+from datetime import timedelta
+
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, Alignment, PatternFill
+from openpyxl.utils import get_column_letter
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import LongTable, SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from django.db.models import Case, CharField, F, Func, IntegerField, OuterRef, Subquery, Value, When
+from django.utils import timezone
+
+from authentication.models import User
+from exams.models import Exam, UserExam, ExamSession
+
+
+# PDF paragraph styles are built once per process and shared by the PDF exports
+PDF_STYLES = getSampleStyleSheet()
+PDF_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=PDF_STYLES['Heading1'],
+    fontSize=18,
+    spaceAfter=30,
+    alignment=1  # Center alignment
+)
+PDF_SECTION_STYLE = ParagraphStyle(
+    'SectionTitle',
+    parent=PDF_STYLES['Heading2'],
+    fontSize=14,
+    spaceAfter=12,
+    spaceBefore=20
+)
+
+DATE_FORMAT = '%Y-%m-%d'
+DATETIME_FORMAT = '%Y-%m-%d %H:%M'
+SHORT_DATETIME_FORMAT = '%m/%d %H:%M'
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+ONE_SECOND = timedelta(seconds=1)
+
+PDF_INFO_TABLE_STYLE = TableStyle([
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+])
+
+PDF_HISTORY_TABLE_STYLE = TableStyle([
+    # Header style
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#366092')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+
+    # Body style
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 8),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.beige, colors.white]),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
+PDF_REPORT_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#366092')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 9),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 8),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.beige, colors.white]),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
+
+def _truncate(text, length):
+    """Shorten text to length characters plus an ellipsis so it fits a PDF column."""
+    return text if len(text) <= length else text[:length] + '...'
+
+
+def _completion_rate(total_completed, total_assigned):
+    """Format the share of completed assignments as a percentage."""
+    rate = (total_completed / total_assigned * 100) if total_assigned > 0 else 0
+    return f"{rate:.1f}%"
+
+
+def _format_duration(start_time, end_time):
+    """Format the time between start and end as 'Xh Ym', or N/A if either is missing."""
+    if not (start_time and end_time):
+        return "N/A"
+    # Whole seconds by floor division keeps the arithmetic in integers
+    seconds = (end_time - start_time) // ONE_SECOND
+    return f"{seconds // 3600}h {seconds % 3600 // 60}m"
+
+
+def _count_subquery(queryset):
+    """Correlated scalar COUNT(*) over queryset, without a GROUP BY on the outer query."""
+    return Subquery(
+        queryset.order_by().annotate(n=Func(F('pk'), function='COUNT')).values('n'),
+        output_field=IntegerField()
+    )
+
+
+def assignment_counts(outer_field):
+    """
+    Annotations counting the UserExam rows whose ``outer_field`` is the outer
+    row, and how many of them have a submitted session. Each count is its own
+    subquery, so the outer query is not joined to assignments and sessions.
+    """
+    assigned = UserExam.objects.filter(**{outer_field: OuterRef('pk')})
+    completed = assigned.filter(completion_state='completed')
+    return {
+        'total_assigned': _count_subquery(assigned),
+        'total_completed': _count_subquery(completed),
+    }
+
+
+def user_history_rows(user):
+    """Yield (exam, course, status, assigned, due, attempts) for each exam assigned to the user."""
+    # Status labels are mapped in SQL so rows come back ready to write out
+    user_exams = UserExam.objects.filter(user=user).annotate(
+        attempts=_count_subquery(
+            ExamSession.objects.filter(user_exam=OuterRef('pk'), is_submitted=True)
+        ),
+        status=Case(
+            *[When(completion_state=state, then=Value(label)) for state, label in UserExam.COMPLETION_STATES],
+            output_field=CharField()
+        )
+    ).order_by('-assigned_date').values_list(
+        'exam__exam_title', 'exam__course__course_name', 'status', 'assigned_date', 'due_date', 'attempts'
+    )
+    return user_exams.iterator(chunk_size=5000)
+
+
+def workbook_bytes(wb):
+    """Serialize a workbook to xlsx bytes."""
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+def _styled_row(ws, values, font=None, fill=None, alignment=None):
+    """Wrap values in WriteOnlyCell so a streamed row can carry styles."""
+    row = []
+    for value in values:
+        cell = WriteOnlyCell(ws, value=value)
+        if font:
+            cell.font = font
+        if fill:
+            cell.fill = fill
+        if alignment:
+            cell.alignment = alignment
+        row.append(cell)
+    return row
+
+
+def _create_sheet(wb, title, heading, info, headers, widths):
+    """
+    Start a write-only sheet with its heading, info lines and styled header row.
+    Column widths must be set before the first row is written, so they are
+    fixed per report rather than measured from the data afterwards.
+    """
+    ws = wb.create_sheet(title)
+    for column, width in enumerate(widths, 1):
+        ws.column_dimensions[get_column_letter(column)].width = width
+    
+    ws.append(_styled_row(ws, [heading], font=Font(bold=True, size=16)))
+    ws.append([])
+    for label, value in info:
+        ws.append([label, value])
+    ws.append([])
+    ws.append(_styled_row(
+        ws, headers,
+        font=Font(bold=True, color="FFFFFF"),
+        fill=PatternFill(start_color="366092", end_color="366092", fill_type="solid"),
+        alignment=Alignment(horizontal="center", vertical="center")
+    ))
+    return ws
+
+
+def build_user_history_workbook(user):
+    """Build the user history Excel workbook, streaming rows to disk as they are read"""
+    wb = openpyxl.Workbook(write_only=True)
+    ws = _create_sheet(
+        wb, "User History", f"Exam History Report - {user.name}",
+        [
+            ("National ID:", user.national_id),
+            ("Position:", user.position),
+            ("Generated:", timezone.now().strftime(TIMESTAMP_FORMAT)),
+        ],
+        ['Exam Name', 'Course', 'Status', 'Assigned Date', 'Due Date', 'Attempts', 'Score'],
+        [40, 30, 14, 16, 16, 10, 10]
+    )
+    
+    for exam_title, course_name, status, assigned_date, due_date, attempts in user_history_rows(user):
+        ws.append([
+            exam_title,
+            course_name,
+            status,
+            assigned_date.strftime(DATE_FORMAT),
+            due_date.strftime(DATE_FORMAT) if due_date else 'No due date',
+            attempts,
+            # Score is calculated but not stored in ExamSession
+            "N/A",
+        ])
+    
+    return wb
+
+
+def build_reports_workbook():
+    """Build the reports Excel workbook, streaming rows to disk as they are read"""
+    # Get exam performance data
+    # Note: Score is calculated but not stored in ExamSession model
+    exams = Exam.objects.annotate(**assignment_counts('exam')).values_list(
+        'exam_title', 'course__course_name', 'total_assigned', 'total_completed'
+    )
+    
+    # Get user performance data
+    users = User.objects.annotate(**assignment_counts('user')).values_list(
+        'name', 'national_id', 'total_assigned', 'total_completed'
+    )
+    
+    # Get recent activity
+    recent_sessions = ExamSession.objects.filter(
+        is_submitted=True
+    ).order_by('-end_time').values_list(
+        'user_exam__user__name', 'user_exam__exam__exam_title', 'start_time', 'end_time'
+    )[:20]
+    
+    wb = openpyxl.Workbook(write_only=True)
+    info = [("Generated:", timezone.now().strftime(TIMESTAMP_FORMAT))]
+    
+    # Sheet 1: Exam Performance
+    ws1 = _create_sheet(
+        wb, "Exam Performance", "Exam Performance Report", info,
+        ['Exam Name', 'Course', 'Total Assigned', 'Total Completed', 'Completion Rate', 'Average Score'],
+        [40, 30, 16, 16, 16, 15]
+    )
+    for exam_title, course_name, total_assigned, total_completed in exams.iterator(chunk_size=5000):
+        # Since score is not stored in ExamSession, we can't calculate average score here
+        ws1.append([
+            exam_title, course_name, total_assigned or 0, total_completed or 0,
+            _completion_rate(total_completed, total_assigned), "N/A",
+        ])
+    
+    # Sheet 2: User Performance
+    ws2 = _create_sheet(
+        wb, "User Performance", "User Performance Report", info,
+        ['Full Name', 'National ID', 'Total Assigned', 'Total Completed', 'Completion Rate', 'Average Score'],
+        [30, 18, 16, 16, 16, 15]
+    )
+    for name, national_id, total_assigned, total_completed in users.iterator(chunk_size=5000):
+        # Since score is not stored in ExamSession, we can't calculate average score here
+        ws2.append([
+            name, national_id, total_assigned or 0, total_completed or 0,
+            _completion_rate(total_completed, total_assigned), "N/A",
+        ])
+    
+    # Sheet 3: Recent Activity
+    ws3 = _create_sheet(
+        wb, "Recent Activity", "Recent Activity Report", info,
+        ['User', 'Exam', 'Score', 'Submitted Date', 'Duration'],
+        [30, 40, 10, 18, 12]
+    )
+    for user_name, exam_title, start_time, end_time in recent_sessions:
+        ws3.append([
+            user_name,
+            exam_title,
+            "N/A",  # Score is calculated but not stored in ExamSession
+            end_time.strftime(DATETIME_FORMAT) if end_time else "N/A",
+            _format_duration(start_time, end_time),
+        ])
+    
+    return wb
+
+
+def build_user_history_pdf(user):
+    """Build the user history PDF and return its bytes"""
+    now = timezone.now()
+    
+    # Create PDF buffer
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
+    
+    # Container for the 'Flowable' objects
+    elements = []
+    
+    # Add title
+    title = Paragraph(f"Exam History Report - {user.name}", PDF_TITLE_STYLE)
+    elements.append(title)
+    
+    # Add user info
+    user_info = [
+        ["National ID:", user.national_id],
+        ["Position:", user.position],
+        ["Generated:", now.strftime(TIMESTAMP_FORMAT)]
+    ]
+    
+    user_info_table = Table(user_info, colWidths=[2*inch, 4*inch])
+    user_info_table.setStyle(PDF_INFO_TABLE_STYLE)
+    elements.append(user_info_table)
+    elements.append(Spacer(1, 20))
+    
+    # Prepare exam data
+    data = [['Exam Name', 'Course', 'Status', 'Assigned', 'Due Date', 'Attempts', 'Score']]
+    data.extend(
+        (
+            _truncate(exam_title, 20),
+            _truncate(course_name, 15),
+            status,
+            assigned_date.strftime(DATE_FORMAT),
+            due_date.strftime(DATE_FORMAT) if due_date else 'No due date',
+            str(attempts),
+            "N/A"  # Score is calculated but not stored in ExamSession
+        )
+        for exam_title, course_name, status, assigned_date, due_date, attempts in user_history_rows(user)
+    )
+    
+    # LongTable lays out rows page by page; the header repeats on each page
+    table = LongTable(data, colWidths=[1.5*inch, 1.2*inch, 0.8*inch, 0.8*inch, 0.8*inch, 0.6*inch, 0.7*inch], repeatRows=1)
+    table.setStyle(PDF_HISTORY_TABLE_STYLE)
+    
+    elements.append(table)
+    
+    # Build PDF
+    doc.build(elements)
+    
+    # Get the value of the BytesIO buffer
+    pdf = buffer.getvalue()
+    buffer.close()
+    return pdf
+
+
+def build_reports_pdf():
+    """Build the reports PDF and return its bytes"""
+    now = timezone.now()
+    
+    # Get exam performance data
+    # Note: Score is calculated but not stored in ExamSession model
+    exams = Exam.objects.annotate(**assignment_counts('exam')).values_list(
+        'exam_title', 'course__course_name', 'total_assigned', 'total_completed'
+    )[:10]  # Limit for PDF
+    
+    # Get user performance data
+    users = User.objects.annotate(**assignment_counts('user')).values_list(
+        'name', 'national_id', 'total_assigned', 'total_completed'
+    )[:10]  # Limit for PDF
+    
+    # Get recent activity
+    recent_sessions = ExamSession.objects.filter(
+        is_submitted=True
+    ).order_by('-end_time').values_list(
+        'user_exam__user__name', 'user_exam__exam__exam_title', 'start_time', 'end_time'
+    )[:10]
+    
+    # Create PDF buffer
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
+    
+    # Container for the 'Flowable' objects
+    elements = []
+    
+    # Add title
+    title = Paragraph("System Reports & Analytics", PDF_TITLE_STYLE)
+    elements.append(title)
+    
+    # Add generation info
+    gen_info = Paragraph(f"Generated: {now.strftime(TIMESTAMP_FORMAT)}", PDF_STYLES['Normal'])
+    elements.append(gen_info)
+    elements.append(Spacer(1, 20))
+    
+    # Exam Performance Section
+    elements.append(Paragraph("Exam Performance", PDF_SECTION_STYLE))
+    
+    exam_data = [['Exam Name', 'Course', 'Assigned', 'Completed', 'Rate', 'Avg Score']]
+    # Since score is not stored in ExamSession, we can't calculate average score
+    exam_data.extend(
+        (
+            _truncate(exam_title, 15),
+            _truncate(course_name, 12),
+            str(total_assigned or 0),
+            str(total_completed or 0),
+            _completion_rate(total_completed, total_assigned),
+            "N/A"
+        )
+        for exam_title, course_name, total_assigned, total_completed in exams
+    )
+    
+    exam_table = LongTable(exam_data, colWidths=[1.5*inch, 1.2*inch, 0.7*inch, 0.7*inch, 0.6*inch, 0.8*inch], repeatRows=1)
+    exam_table.setStyle(PDF_REPORT_TABLE_STYLE)
+    elements.append(exam_table)
+    elements.append(Spacer(1, 20))
+    
+    # User Performance Section
+    elements.append(Paragraph("User Performance (Top 10)", PDF_SECTION_STYLE))
+    
+    user_data = [['Full Name', 'National ID', 'Assigned', 'Completed', 'Rate', 'Avg Score']]
+    # Since score is not stored in ExamSession, we can't calculate average score
+    user_data.extend(
+        (
+            _truncate(name, 15),
+            national_id,
+            str(total_assigned or 0),
+            str(total_completed or 0),
+            _completion_rate(total_completed, total_assigned),
+            "N/A"
+        )
+        for name, national_id, total_assigned, total_completed in users
+    )
+    
+    user_table = LongTable(user_data, colWidths=[1.5*inch, 1.0*inch, 0.7*inch, 0.7*inch, 0.6*inch, 0.8*inch], repeatRows=1)
+    user_table.setStyle(PDF_REPORT_TABLE_STYLE)
+    elements.append(user_table)
+    elements.append(Spacer(1, 20))
+    
+    # Recent Activity Section
+    elements.append(Paragraph("Recent Activity", PDF_SECTION_STYLE))
+    
+    activity_data = [['User', 'Exam', 'Score', 'Date', 'Duration']]
+    activity_data.extend(
+        (
+            _truncate(user_name, 12),
+            _truncate(exam_title, 15),
+            "N/A",  # Score is calculated but not stored in ExamSession
+            end_time.strftime(SHORT_DATETIME_FORMAT) if end_time else "N/A",
+            _format_duration(start_time, end_time)
+        )
+        for user_name, exam_title, start_time, end_time in recent_sessions
+    )
+    
+    activity_table = LongTable(activity_data, colWidths=[1.3*inch, 1.5*inch, 0.7*inch, 0.8*inch, 0.7*inch], repeatRows=1)
+    activity_table.setStyle(PDF_REPORT_TABLE_STYLE)
+    elements.append(activity_table)
+    
+    # Build PDF
+    doc.build(elements)
+    
+    # Get the value of the BytesIO buffer
+    pdf = buffer.getvalue()
+    buffer.close()
+    return pdf
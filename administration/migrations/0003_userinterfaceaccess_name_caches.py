@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-15 03:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('administration', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userinterfaceaccess',
+            name='interface_module_cache',
+            field=models.CharField(default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='userinterfaceaccess',
+            name='user_name_cache',
+            field=models.CharField(default='', max_length=255),
+        ),
+    ]
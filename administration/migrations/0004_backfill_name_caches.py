@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_name_caches(apps, schema_editor):
+    UserInterfaceAccess = apps.get_model('administration', 'UserInterfaceAccess')
+    Interface = apps.get_model('administration', 'Interface')
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    UserInterfaceAccess.objects.update(
+        user_name_cache=Subquery(User.objects.filter(pk=OuterRef('user_id')).values('name')[:1]),
+        interface_module_cache=Subquery(
+            Interface.objects.filter(pk=OuterRef('interface_id')).values('module_name')[:1]
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('administration', '0003_userinterfaceaccess_name_caches'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_name_caches, migrations.RunPython.noop),
+    ]
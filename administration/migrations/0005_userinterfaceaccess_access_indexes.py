@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-15 03:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('administration', '0004_backfill_name_caches'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userinterfaceaccess',
+            index=models.Index(fields=['user', 'has_access'], name='uia_user_access_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userinterfaceaccess',
+            index=models.Index(fields=['interface', 'has_access'], name='uia_iface_access_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-15 03:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('administration', '0005_userinterfaceaccess_access_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userinterfaceaccess',
+            index=models.Index(fields=['-granted_date'], name='uia_granted_desc_idx'),
+        ),
+    ]
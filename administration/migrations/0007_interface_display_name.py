@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-15 03:52
+
+from django.db import migrations, models
+from django.db.models import Value
+from django.db.models.functions import Concat
+
+
+def backfill_display_name(apps, schema_editor):
+    Interface = apps.get_model('administration', 'Interface')
+    Interface.objects.update(
+        display_name=Concat('module_name', Value(' - '), 'function', output_field=models.CharField())
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('administration', '0006_userinterfaceaccess_granted_date_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interface',
+            name='display_name',
+            field=models.CharField(default='', editable=False, max_length=513),
+        ),
+        migrations.RunPython(backfill_display_name, migrations.RunPython.noop),
+    ]
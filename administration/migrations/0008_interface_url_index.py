@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-15 04:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('administration', '0007_interface_display_name'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='interface',
+            index=models.Index(fields=['url'], name='interfaces_url_idx'),
+        ),
+    ]
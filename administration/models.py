@@ -8,15 +8,27 @@ class Interface(models.Model):
     module_name = models.CharField(max_length=255, help_text='Name of the interface/module')
     function = models.CharField(max_length=255, help_text='Function or purpose of the interface')
     url = models.CharField(max_length=500, help_text='URL pattern for the interface')
+    # Stored "module - function" label, filled in save() so __str__ needs no formatting
+    display_name = models.CharField(max_length=513, default='', editable=False)
     created_at = models.DateTimeField(default=timezone.now)
     
     class Meta:
         db_table = 'interfaces'
         verbose_name = 'Interface'
         verbose_name_plural = 'Interfaces'
+        indexes = [
+            models.Index(fields=['url'], name='interfaces_url_idx'),
+        ]
     
     def __str__(self):
-        return f"{self.module_name} - {self.function}"
+        return self.display_name or f"{self.module_name} - {self.function}"
+    
+    def save(self, *args, **kwargs):
+        self.display_name = f"{self.module_name} - {self.function}"
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'module_name', 'function'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'display_name'}
+        super().save(*args, **kwargs)
 
 
 class UserInterfaceAccess(models.Model):
@@ -32,13 +44,40 @@ class UserInterfaceAccess(models.Model):
         blank=True,
         related_name='granted_access'
     )
+    # Denormalized copies of the related names, kept in sync by administration.signals
+    user_name_cache = models.CharField(max_length=255, default='')
+    interface_module_cache = models.CharField(max_length=255, default='')
     
     class Meta:
         db_table = 'userinterfaceaccess'
         verbose_name = 'User Interface Access'
         verbose_name_plural = 'User Interface Access'
         unique_together = ['user', 'interface']
+        indexes = [
+            models.Index(fields=['user', 'has_access'], name='uia_user_access_idx'),
+            models.Index(fields=['interface', 'has_access'], name='uia_iface_access_idx'),
+            models.Index(fields=['-granted_date'], name='uia_granted_desc_idx'),
+        ]
     
     def __str__(self):
         access_status = 'Granted' if self.has_access else 'Denied'
-        return f"{self.user.name} - {self.interface.module_name} - {access_status}"
+        user_name = self.user_name_cache or self.user.name
+        module_name = self.interface_module_cache or self.interface.module_name
+        return f"{user_name} - {module_name} - {access_status}"
+    
+    def save(self, *args, **kwargs):
+        # Re-copy the names whenever the relations are written, so reassigning
+        # a record to another user or interface does not leave stale names
+        update_fields = kwargs.get('update_fields')
+        written = None if update_fields is None else set(update_fields)
+        if self.user_id and (written is None or {'user', 'user_id'} & written):
+            self.user_name_cache = self.user.name
+            if written is not None:
+                written.add('user_name_cache')
+        if self.interface_id and (written is None or {'interface', 'interface_id'} & written):
+            self.interface_module_cache = self.interface.module_name
+            if written is not None:
+                written.add('interface_module_cache')
+        if written is not None:
+            kwargs['update_fields'] = written
+        super().save(*args, **kwargs)
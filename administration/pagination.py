@@ -0,0 +1,124 @@
+import hashlib
+
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+
+CURSOR_SEPARATOR = '~'
+COUNT_CACHE_TIMEOUT = 30
+
+
+class KeysetPage:
+    """One page of a keyset-paginated list, iterable like a Paginator page."""
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Paginate a queryset newest-first on a datetime field by seeking past a
+    cursor instead of using OFFSET, so deep pages cost the same as the first
+    and no COUNT(*) is issued. The primary key breaks ties between rows that
+    share the same timestamp. Works with model and values() querysets, as
+    long as values() includes the field and the primary key.
+    """
+
+    def __init__(self, queryset, per_page, field):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.field = field
+
+    def encode(self, obj):
+        if isinstance(obj, dict):
+            value, pk = obj[self.field], obj[self.queryset.model._meta.pk.attname]
+        else:
+            value, pk = getattr(obj, self.field), obj.pk
+        return f'{value.isoformat()}{CURSOR_SEPARATOR}{pk}'
+
+    def decode(self, cursor):
+        if not cursor:
+            return None
+        value, _, pk = cursor.rpartition(CURSOR_SEPARATOR)
+        try:
+            value = parse_datetime(value)
+            pk = int(pk)
+        except ValueError:
+            return None
+        if value is None:
+            return None
+        return value, pk
+
+    def get_page(self, after=None, before=None):
+        """Return the page following the ``after`` cursor, or preceding ``before``."""
+        field = self.field
+        position = self.decode(before)
+        if position is not None:
+            value, pk = position
+            rows = list(
+                self.queryset.filter(
+                    Q(**{f'{field}__gt': value}) | Q(**{field: value, 'pk__gt': pk})
+                ).order_by(field, 'pk')[:self.per_page + 1]
+            )
+            has_more = len(rows) > self.per_page
+            rows = rows[:self.per_page][::-1]
+            return KeysetPage(
+                rows,
+                next_cursor=self.encode(rows[-1]) if rows else None,
+                previous_cursor=self.encode(rows[0]) if has_more else None,
+            )
+
+        queryset = self.queryset
+        position = self.decode(after)
+        if position is not None:
+            value, pk = position
+            queryset = queryset.filter(
+                Q(**{f'{field}__lt': value}) | Q(**{field: value, 'pk__lt': pk})
+            )
+        rows = list(queryset.order_by(f'-{field}', '-pk')[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        return KeysetPage(
+            rows,
+            next_cursor=self.encode(rows[-1]) if has_more else None,
+            previous_cursor=self.encode(rows[0]) if position is not None and rows else None,
+        )
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Paginator that caches the COUNT(*) for a given filtered queryset for a
+    short window, so paging through a list or reloading it does not repeat
+    the count on every request.
+    """
+
+    @cached_property
+    def count(self):
+        sql, params = self.object_list.query.sql_with_params()
+        digest = hashlib.md5(f'{sql}{params}'.encode()).hexdigest()
+        key = f'paginator_count:{digest}'
+        count = cache.get(key)
+        if count is None:
+            count = super().count
+            cache.set(key, count, COUNT_CACHE_TIMEOUT)
+        return count
@@ -0,0 +1,209 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Count, Exists, F, OuterRef, Q
+from django.utils import timezone
+
+from exams.models import Course, Exam, UserExam
+
+from .models import Interface, UserInterfaceAccess
+
+
+INTERFACES_CACHE_KEY = 'interfaces:v1'
+INTERFACE_URLS_CACHE_KEY = 'interfaces:by_url:v1'
+INTERFACE_ACCESS_TIMEOUT = 300
+COURSE_SUGGESTIONS_VERSION_KEY = 'course_suggestions:version'
+COURSE_SUGGESTIONS_TIMEOUT = 60
+DASHBOARD_STATS_CACHE_KEY = 'admin:dashboard:stats:v2'
+DASHBOARD_STATS_TIMEOUT = 60
+COURSE_CHOICES_CACHE_KEY = 'choices:courses'
+EXAM_CHOICES_CACHE_KEY = 'choices:exams'
+CHOICES_TIMEOUT = 300
+EXPORTS_VERSION_KEY = 'exports:version'
+EXPORT_CACHE_TIMEOUT = 300
+
+
+def get_interfaces():
+    """Return all interfaces as dicts, cached until an interface changes."""
+    interfaces = cache.get(INTERFACES_CACHE_KEY)
+    if interfaces is None:
+        interfaces = list(
+            Interface.objects.order_by('module_name', 'function')
+            .values('interface_id', 'module_name', 'function', 'url')
+        )
+        cache.set(INTERFACES_CACHE_KEY, interfaces, None)
+    return interfaces
+
+
+def get_interface_for_url(url):
+    """Return the interface dict registered for url, or None."""
+    by_url = cache.get(INTERFACE_URLS_CACHE_KEY)
+    if by_url is None:
+        by_url = {interface['url']: interface for interface in get_interfaces()}
+        cache.set(INTERFACE_URLS_CACHE_KEY, by_url, None)
+    return by_url.get(url)
+
+
+def find_interface(**lookup):
+    """Return the first cached interface dict whose fields equal lookup, or None."""
+    for interface in get_interfaces():
+        if all(interface[field] == value for field, value in lookup.items()):
+            return interface
+    return None
+
+
+def invalidate_interfaces():
+    cache.delete_many([INTERFACES_CACHE_KEY, INTERFACE_URLS_CACHE_KEY])
+
+
+def _interface_access_key(user_id):
+    return f'interface_access:{user_id}'
+
+
+def get_granted_interface_ids(user_id):
+    """Return the ids of the interfaces the user has been granted, cached per user."""
+    key = _interface_access_key(user_id)
+    granted = cache.get(key)
+    if granted is None:
+        granted = frozenset(
+            UserInterfaceAccess.objects.filter(user_id=user_id, has_access=True)
+            .values_list('interface_id', flat=True)
+        )
+        cache.set(key, granted, INTERFACE_ACCESS_TIMEOUT)
+    return granted
+
+
+def get_user_interface_ids(user):
+    """
+    Return the user's granted interface ids, kept on the user instance so the
+    middleware and view decorators share one cache read per request.
+    """
+    try:
+        return user._interface_ids
+    except AttributeError:
+        user._interface_ids = get_granted_interface_ids(user.pk)
+        return user._interface_ids
+
+
+def invalidate_interface_access(user_ids):
+    cache.delete_many([_interface_access_key(user_id) for user_id in user_ids])
+
+
+def get_course_suggestions(query):
+    """Return up to 10 course names starting with query, cached per prefix."""
+    version = cache.get_or_set(COURSE_SUGGESTIONS_VERSION_KEY, 1, None)
+    key = f'course_suggestions:{version}:{query.lower()}'
+    suggestions = cache.get(key)
+    if suggestions is None:
+        suggestions = list(
+            Course.objects.filter(course_name__istartswith=query)
+            .order_by('course_name')
+            .values_list('course_name', flat=True)
+            .distinct()[:10]
+        )
+        cache.set(key, suggestions, COURSE_SUGGESTIONS_TIMEOUT)
+    return suggestions
+
+
+def invalidate_course_suggestions():
+    # Bumping the version orphans every cached prefix without a key scan
+    try:
+        cache.incr(COURSE_SUGGESTIONS_VERSION_KEY)
+    except ValueError:
+        pass
+
+
+def get_dashboard_stats():
+    """Return the dashboard tile counts, cached for DASHBOARD_STATS_TIMEOUT seconds."""
+    stats = cache.get(DASHBOARD_STATS_CACHE_KEY)
+    if stats is not None:
+        return stats
+
+    now = timezone.now()
+    soon = now + timedelta(days=1)
+
+    # One aggregate query per table
+    user_stats = get_user_model().objects.aggregate(
+        total=Count('pk'),
+        active=Count('pk', filter=Q(is_active=True)),
+        inactive=Count('pk', filter=Q(is_active=True, last_login__lt=now - timedelta(days=30)))
+    )
+    # Courses have no status flag; count the ones with an exam open right now
+    course_stats = Course.objects.aggregate(
+        total=Count('pk'),
+        with_open_exams=Count('pk', filter=Q(Exists(
+            Exam.objects.filter(course=OuterRef('pk'), start_time__lte=now, end_time__gte=now)
+        )))
+    )
+    exam_stats = Exam.objects.aggregate(
+        total=Count('pk'),
+        active=Count('pk', filter=Q(start_time__lte=now, end_time__gte=now)),
+        ending_soon=Count('pk', filter=Q(end_time__gte=now, end_time__lte=soon))
+    )
+    total_submissions = UserExam.objects.filter(completion_state='completed').count()
+
+    stats = {
+        'total_users': user_stats['total'],
+        'active_users': user_stats['active'],
+        'inactive_users': user_stats['inactive'],
+        'total_courses': course_stats['total'],
+        'courses_with_open_exams': course_stats['with_open_exams'],
+        'total_exams': exam_stats['total'],
+        'active_exams': exam_stats['active'],
+        'exams_ending_soon': exam_stats['ending_soon'],
+        'total_submissions': total_submissions,
+    }
+    cache.set(DASHBOARD_STATS_CACHE_KEY, stats, DASHBOARD_STATS_TIMEOUT)
+    return stats
+
+
+def invalidate_dashboard_stats():
+    cache.delete(DASHBOARD_STATS_CACHE_KEY)
+
+
+def get_course_choices():
+    """Return courses for form dropdowns as dicts, ordered by name."""
+    choices = cache.get(COURSE_CHOICES_CACHE_KEY)
+    if choices is None:
+        choices = list(Course.objects.order_by('course_name').values('course_id', 'course_name'))
+        cache.set(COURSE_CHOICES_CACHE_KEY, choices, CHOICES_TIMEOUT)
+    return choices
+
+
+def get_exam_choices():
+    """Return exams for form dropdowns as dicts with their course name, ordered by title."""
+    choices = cache.get(EXAM_CHOICES_CACHE_KEY)
+    if choices is None:
+        choices = list(
+            Exam.objects.order_by('exam_title')
+            .values('exam_id', 'exam_title', course_name=F('course__course_name'))
+        )
+        cache.set(EXAM_CHOICES_CACHE_KEY, choices, CHOICES_TIMEOUT)
+    return choices
+
+
+def invalidate_choices():
+    cache.delete_many([COURSE_CHOICES_CACHE_KEY, EXAM_CHOICES_CACHE_KEY])
+
+
+def get_cached_export(name, build):
+    """
+    Return the bytes of the export called name, calling build() only when no
+    copy is cached for the current version of the report data.
+    """
+    version = cache.get_or_set(EXPORTS_VERSION_KEY, 1, None)
+    key = f'export:{version}:{name}'
+    content = cache.get(key)
+    if content is None:
+        content = build()
+        cache.set(key, content, EXPORT_CACHE_TIMEOUT)
+    return content
+
+
+def invalidate_exports():
+    # Reports span users, exams and sessions, so any change orphans every cached file
+    try:
+        cache.incr(EXPORTS_VERSION_KEY)
+    except ValueError:
+        pass
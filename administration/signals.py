@@ -0,0 +1,113 @@
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from exams.models import Course, Exam, ExamSession, UserExam
+
+from .models import Interface, UserInterfaceAccess
+from .services import (
+    invalidate_choices,
+    invalidate_course_suggestions,
+    invalidate_dashboard_stats,
+    invalidate_exports,
+    invalidate_interface_access,
+    invalidate_interfaces,
+)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def sync_user_name_cache(sender, instance, created, update_fields=None, **kwargs):
+    """Keep the denormalized user name on access records up to date."""
+    # Saves that leave the name alone, such as the last_login write on every
+    # login, need no UPDATE
+    if created or (update_fields is not None and 'name' not in update_fields):
+        return
+    UserInterfaceAccess.objects.filter(user=instance).exclude(
+        user_name_cache=instance.name
+    ).update(user_name_cache=instance.name)
+
+
+@receiver(post_save, sender=Interface)
+def sync_interface_module_cache(sender, instance, created, update_fields=None, **kwargs):
+    """Keep the denormalized module name on access records up to date."""
+    if created or (update_fields is not None and 'module_name' not in update_fields):
+        return
+    UserInterfaceAccess.objects.filter(interface=instance).exclude(
+        interface_module_cache=instance.module_name
+    ).update(interface_module_cache=instance.module_name)
+
+
+@receiver(post_save, sender=Interface)
+@receiver(post_delete, sender=Interface)
+def clear_interfaces_cache(sender, **kwargs):
+    """Drop the cached interface list whenever an interface changes."""
+    invalidate_interfaces()
+
+
+@receiver(post_save, sender=UserInterfaceAccess)
+@receiver(post_delete, sender=UserInterfaceAccess)
+def clear_interface_access_cache(sender, instance, **kwargs):
+    """Drop the user's cached grants when one of their access records changes."""
+    invalidate_interface_access([instance.user_id])
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def clear_course_suggestions_cache(sender, **kwargs):
+    """Expire cached course name suggestions whenever a course changes."""
+    invalidate_course_suggestions()
+
+
+@receiver(post_save, sender=ExamSession)
+def sync_completion_state_on_save(sender, instance, created, **kwargs):
+    """Keep the denormalized completion state on the assignment up to date."""
+    assignments = UserExam.objects.filter(pk=instance.user_exam_id)
+    if instance.is_submitted:
+        assignments.exclude(completion_state='completed').update(completion_state='completed')
+    elif created:
+        assignments.filter(completion_state='not_started').update(completion_state='in_progress')
+    else:
+        # A session was reopened; other sessions decide the state
+        for user_exam in assignments.only('pk', 'completion_state'):
+            user_exam.refresh_completion_state()
+
+
+@receiver(post_delete, sender=ExamSession)
+def sync_completion_state_on_delete(sender, instance, **kwargs):
+    """Recompute the assignment's completion state once one of its sessions is gone."""
+    for user_exam in UserExam.objects.filter(pk=instance.user_exam_id).only('pk', 'completion_state'):
+        user_exam.refresh_completion_state()
+
+
+@receiver(post_save, sender=ExamSession)
+def clear_dashboard_stats_cache(sender, instance, **kwargs):
+    """Refresh the dashboard submission count once an exam is submitted."""
+    if instance.is_submitted:
+        invalidate_dashboard_stats()
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+@receiver(post_save, sender=Exam)
+@receiver(post_delete, sender=Exam)
+def clear_choices_cache(sender, **kwargs):
+    """Drop the cached course/exam dropdowns; exam choices embed the course name."""
+    invalidate_choices()
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+@receiver(post_save, sender=Exam)
+@receiver(post_delete, sender=Exam)
+@receiver(post_save, sender=UserExam)
+@receiver(post_delete, sender=UserExam)
+@receiver(post_save, sender=ExamSession)
+@receiver(post_delete, sender=ExamSession)
+def clear_exports_cache(sender, update_fields=None, **kwargs):
+    """Expire cached report exports whenever the data they are built from changes."""
+    # Logins only touch last_login, which no export shows
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    invalidate_exports()
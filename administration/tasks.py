@@ -0,0 +1,95 @@
+from datetime import timedelta
+
+from celery import shared_task
+from django.core.files.base import ContentFile
+from django.core.files.storage import InvalidStorageError, default_storage, storages
+from django.utils import timezone
+
+from authentication.models import User
+from .exports import (
+    build_reports_pdf,
+    build_reports_workbook,
+    build_user_history_pdf,
+    build_user_history_workbook,
+    workbook_bytes,
+)
+
+
+EXPORT_FILE_DIR = 'exports'
+EXPORT_FILE_MAX_AGE = timedelta(hours=24)
+
+
+def get_export_storage():
+    """
+    Storage for background export files: the 'exports' alias from STORAGES
+    when one is configured (ideally private), otherwise the default storage.
+    """
+    try:
+        return storages['exports']
+    except InvalidStorageError:
+        return default_storage
+
+
+def is_export_file(name):
+    """Whether name is a stored export file that has not expired yet."""
+    storage = get_export_storage()
+    if not (isinstance(name, str) and name.startswith(f'{EXPORT_FILE_DIR}/')) or not storage.exists(name):
+        return False
+    return storage.get_modified_time(name) >= timezone.now() - EXPORT_FILE_MAX_AGE
+
+
+def _save_export(name, content):
+    """Save export bytes under the exports directory and return the stored name."""
+    return get_export_storage().save(f'{EXPORT_FILE_DIR}/{name}', ContentFile(content))
+
+
+def _save_workbook(wb, name):
+    """Save a workbook to the export storage and return the stored name."""
+    return _save_export(name, workbook_bytes(wb))
+
+
+@shared_task(bind=True)
+def build_user_history_xlsx(self, user_id):
+    """Build a user history workbook in the background."""
+    user = User.objects.get(pk=user_id)
+    return _save_workbook(
+        build_user_history_workbook(user),
+        f'user_history_{user.national_id}_{self.request.id}.xlsx'
+    )
+
+
+@shared_task(bind=True)
+def build_reports_xlsx(self):
+    """Build the reports workbook in the background."""
+    return _save_workbook(build_reports_workbook(), f'reports_{self.request.id}.xlsx')
+
+
+@shared_task(bind=True)
+def build_user_history_pdf_file(self, user_id):
+    """Build a user history PDF in the background."""
+    user = User.objects.get(pk=user_id)
+    return _save_export(f'user_history_{user.national_id}_{self.request.id}.pdf', build_user_history_pdf(user))
+
+
+@shared_task(bind=True)
+def build_reports_pdf_file(self):
+    """Build the reports PDF in the background."""
+    return _save_export(f'reports_{self.request.id}.pdf', build_reports_pdf())
+
+
+@shared_task
+def purge_expired_exports():
+    """Delete export files older than EXPORT_FILE_MAX_AGE; run it periodically with Celery beat."""
+    storage = get_export_storage()
+    cutoff = timezone.now() - EXPORT_FILE_MAX_AGE
+    try:
+        _, files = storage.listdir(EXPORT_FILE_DIR)
+    except FileNotFoundError:
+        return 0
+    removed = 0
+    for file_name in files:
+        name = f'{EXPORT_FILE_DIR}/{file_name}'
+        if storage.get_modified_time(name) < cutoff:
+            storage.delete(name)
+            removed += 1
+    return removed
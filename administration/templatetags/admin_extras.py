@@ -2,8 +2,7 @@ from django import template
 
 register = template.Library()
 
-@register.filter
-def lookup(dictionary, key):
+def _lookup(dictionary, key):
     """
     Template filter to lookup a value in a dictionary by key.
     Usage: {{ dict|lookup:key }}
@@ -12,16 +11,22 @@ def lookup(dictionary, key):
         return None
     return dictionary.get(key, False)
 
-@register.filter
-def get_item(dictionary, key):
+
+def _get_item(dictionary, key):
     """
-    Alternative template filter to get an item from a dictionary.
-    Usage: {{ dict|get_item:key }}
+    Template filter/tag to get an item from a dictionary.
+    Usage: {{ dict|get_item:key }}, {{ dict|dict_key:key }}, {% get_dict_value dict key %}
     """
-    if dictionary is None:
+    if not dictionary or not hasattr(dictionary, 'get'):
         return None
     return dictionary.get(key)
 
+
+register.filter('lookup', _lookup)
+register.filter('get_item', _get_item)
+register.filter('dict_key', _get_item)
+register.simple_tag(_get_item, name='get_dict_value')
+
 @register.filter
 def multiply(value, arg):
     """
@@ -45,23 +50,3 @@ def percentage(value, total):
         return round((float(value) / float(total)) * 100, 1)
     except (ValueError, TypeError):
         return 0
-
-@register.filter
-def dict_key(dictionary, key):
-    """
-    Template filter to access dictionary values by key.
-    Usage: {{ dict|dict_key:key }}
-    """
-    if isinstance(dictionary, dict):
-        return dictionary.get(key)
-    return None
-
-@register.simple_tag
-def get_dict_value(dictionary, key):
-    """
-    Template tag to get dictionary value by key.
-    Usage: {% get_dict_value dict key %}
-    """
-    if isinstance(dictionary, dict):
-        return dictionary.get(key)
-    return None
\ No newline at end of file
@@ -1,3 +1,270 @@
-from django.test import TestCase
+import os
+import tempfile
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from authentication.models import User
+from .models import Interface, UserInterfaceAccess
+from .pagination import KeysetPaginator
+from .services import get_granted_interface_ids, get_interface_for_url
+from .tasks import get_export_storage, purge_expired_exports
+
+
+class BulkInterfaceAccessTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_superuser('00000000000000', 'Admin')
+        self.users = [User.objects.create_user('1000000000000%d' % i, 'User %d' % i) for i in range(2)]
+        self.interfaces = [
+            Interface.objects.create(module_name='Module %d' % i, function='view', url='/module-%d/' % i)
+            for i in range(2)
+        ]
+        # One pair already has a (revoked) row, the other three have none
+        UserInterfaceAccess.objects.create(user=self.users[0], interface=self.interfaces[0], has_access=False)
+        self.client.force_login(self.admin)
+
+    def post(self, action):
+        return self.client.post(reverse('administration:bulk_interface_access'), {
+            'users': [user.pk for user in self.users],
+            'interfaces': [interface.pk for interface in self.interfaces],
+            'action': action,
+        })
+
+    def assert_all_pairs(self, has_access):
+        records = UserInterfaceAccess.objects.all()
+        self.assertEqual(records.count(), 4)
+        self.assertTrue(all(record.has_access is has_access for record in records))
+        self.assertTrue(all(record.granted_by_id == self.admin.pk for record in records))
+
+    def test_grant_updates_existing_and_creates_missing_pairs(self):
+        self.assertEqual(self.post('grant').status_code, 200)
+        self.assert_all_pairs(True)
+        record = UserInterfaceAccess.objects.get(user=self.users[1], interface=self.interfaces[1])
+        self.assertEqual(record.user_name_cache, 'User 1')
+        self.assertEqual(record.interface_module_cache, 'Module 1')
+
+    def test_revoke_after_grant(self):
+        self.post('grant')
+        self.post('revoke')
+        self.assert_all_pairs(False)
+
+    def test_grant_without_upsert_support(self):
+        # Backends such as SQL Server have no ON CONFLICT target
+        with mock.patch.object(connection.features, 'supports_update_conflicts_with_target', False):
+            self.post('grant')
+            self.assert_all_pairs(True)
+            self.post('revoke')
+            self.assert_all_pairs(False)
+
+
+class InterfaceAccessCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('10000000000001', 'User')
+        self.interface = Interface.objects.create(module_name='Reports', function='view', url='/reports/')
+        self.other = Interface.objects.create(module_name='Exams', function='view', url='/exams/')
+        self.access = UserInterfaceAccess.objects.create(user=self.user, interface=self.interface, has_access=True)
+
+    def test_grants_are_cached(self):
+        self.assertEqual(get_granted_interface_ids(self.user.pk), {self.interface.pk})
+        with self.assertNumQueries(0):
+            self.assertEqual(get_granted_interface_ids(self.user.pk), {self.interface.pk})
+
+    def test_saving_access_invalidates_grants(self):
+        get_granted_interface_ids(self.user.pk)
+        UserInterfaceAccess.objects.create(user=self.user, interface=self.other, has_access=True)
+        self.assertEqual(get_granted_interface_ids(self.user.pk), {self.interface.pk, self.other.pk})
+        self.access.has_access = False
+        self.access.save()
+        self.assertEqual(get_granted_interface_ids(self.user.pk), {self.other.pk})
+
+    def test_deleting_access_invalidates_grants(self):
+        get_granted_interface_ids(self.user.pk)
+        self.access.delete()
+        self.assertEqual(get_granted_interface_ids(self.user.pk), frozenset())
+
+    def test_interface_changes_invalidate_url_map(self):
+        self.assertEqual(get_interface_for_url('/reports/')['interface_id'], self.interface.pk)
+        with self.assertNumQueries(0):
+            get_interface_for_url('/reports/')
+        self.interface.url = '/reports/all/'
+        self.interface.save()
+        self.assertIsNone(get_interface_for_url('/reports/'))
+        self.assertEqual(get_interface_for_url('/reports/all/')['interface_id'], self.interface.pk)
+        self.interface.delete()
+        self.assertIsNone(get_interface_for_url('/reports/all/'))
+
+    def test_bulk_grant_invalidates_grants(self):
+        # bulk_create sends no signals, so the view expires the cache itself
+        admin = User.objects.create_superuser('00000000000000', 'Admin')
+        self.client.force_login(admin)
+        get_granted_interface_ids(self.user.pk)
+        self.client.post(reverse('administration:bulk_interface_access'), {
+            'users': [self.user.pk],
+            'interfaces': [self.other.pk],
+            'action': 'grant',
+        })
+        self.assertEqual(get_granted_interface_ids(self.user.pk), {self.interface.pk, self.other.pk})
+
+
+class AccessNameCacheTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('10000000000001', 'Old Name')
+        self.interface = Interface.objects.create(module_name='Old Module', function='view', url='/old/')
+
+    def test_new_access_copies_names(self):
+        UserInterfaceAccess.objects.create(user=self.user, interface=self.interface)
+        access = UserInterfaceAccess.objects.get()
+        with self.assertNumQueries(0):
+            self.assertEqual(str(access), 'Old Name - Old Module - Denied')
+
+    def test_renames_propagate_to_access_records(self):
+        access = UserInterfaceAccess.objects.create(user=self.user, interface=self.interface)
+        self.user.name = 'New Name'
+        self.user.save()
+        self.interface.module_name = 'New Module'
+        self.interface.save()
+        access.refresh_from_db()
+        self.assertEqual(access.user_name_cache, 'New Name')
+        self.assertEqual(access.interface_module_cache, 'New Module')
+
+    def test_reassigning_access_recopies_names(self):
+        access = UserInterfaceAccess.objects.create(user=self.user, interface=self.interface)
+        other_user = User.objects.create_user('10000000000002', 'Bob')
+        other_interface = Interface.objects.create(module_name='Other Module', function='view', url='/other/')
+        access.user = other_user
+        access.interface = other_interface
+        access.save()
+        access = UserInterfaceAccess.objects.get()
+        self.assertEqual(str(access), 'Bob - Other Module - Denied')
+        self.assertTrue(UserInterfaceAccess.objects.filter(user_name_cache__icontains='Bob').exists())
+
+    def test_partial_save_recopies_only_written_relations(self):
+        access = UserInterfaceAccess.objects.create(user=self.user, interface=self.interface)
+        other_user = User.objects.create_user('10000000000002', 'Bob')
+        access.user = other_user
+        access.save(update_fields=['user'])
+        access.refresh_from_db()
+        self.assertEqual(access.user_name_cache, 'Bob')
+        self.assertEqual(access.interface_module_cache, 'Old Module')
+
+    def test_last_login_save_skips_the_name_sync(self):
+        UserInterfaceAccess.objects.create(user=self.user, interface=self.interface)
+        with CaptureQueriesContext(connection) as queries:
+            self.user.save(update_fields=['last_login'])
+        self.assertFalse(any('userinterfaceaccess' in query['sql'] for query in queries.captured_queries))
+
+
+class KeysetPaginatorTests(TestCase):
+    def setUp(self):
+        # Pairs of users share a join timestamp, so the primary key breaks ties
+        now = timezone.now()
+        for i in range(7):
+            User.objects.create_user(
+                '1000000000000%d' % i, 'User %d' % i, date_joined=now - timedelta(minutes=i // 2)
+            )
+        self.queryset = User.objects.all()
+        self.expected = list(self.queryset.order_by('-date_joined', '-pk').values_list('pk', flat=True))
+
+    def pks(self, page):
+        return [user.pk for user in page]
+
+    def walk_forward(self, paginator):
+        pages = [paginator.get_page()]
+        while pages[-1].has_next():
+            pages.append(paginator.get_page(after=pages[-1].next_cursor))
+        return pages
+
+    def test_pages_cover_every_row_once_in_order(self):
+        pages = self.walk_forward(KeysetPaginator(self.queryset, 3, 'date_joined'))
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertEqual([pk for page in pages for pk in self.pks(page)], self.expected)
+        self.assertFalse(pages[0].has_previous())
+        self.assertTrue(pages[-1].has_previous())
+
+    def test_previous_cursor_returns_the_earlier_page(self):
+        paginator = KeysetPaginator(self.queryset, 3, 'date_joined')
+        pages = self.walk_forward(paginator)
+        for earlier, later in zip(pages, pages[1:]):
+            previous = paginator.get_page(before=later.previous_cursor)
+            self.assertEqual(self.pks(previous), self.pks(earlier))
+            self.assertEqual(previous.has_previous(), earlier.has_previous())
+
+    def test_values_queryset(self):
+        paginator = KeysetPaginator(self.queryset.values('id', 'name', 'date_joined'), 3, 'date_joined')
+        pages = self.walk_forward(paginator)
+        self.assertEqual([row['id'] for page in pages for row in page], self.expected)
+
+    def test_invalid_cursor_falls_back_to_first_page(self):
+        paginator = KeysetPaginator(self.queryset, 3, 'date_joined')
+        for cursor in ('garbage', 'not-a-date~1', '2024-01-01T00:00:00~x'):
+            self.assertEqual(self.pks(paginator.get_page(after=cursor)), self.expected[:3])
+
+
+class BackgroundExportDownloadTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        storages = override_settings(STORAGES={
+            'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+            'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+            'exports': {
+                'BACKEND': 'django.core.files.storage.FileSystemStorage',
+                'OPTIONS': {'location': directory.name},
+            },
+        })
+        storages.enable()
+        self.addCleanup(storages.disable)
+        self.directory = directory.name
+        self.name = get_export_storage().save('exports/reports_task.pdf', ContentFile(b'%PDF'))
+        result = mock.patch('administration.views.AsyncResult')
+        self.result = result.start().return_value
+        self.addCleanup(result.stop)
+        self.result.successful.return_value = True
+        self.result.result = self.name
+        self.admin = User.objects.create_superuser('00000000000000', 'Admin')
+        self.client.force_login(self.admin)
+
+    def age(self, name, hours):
+        timestamp = (timezone.now() - timedelta(hours=hours)).timestamp()
+        os.utime(os.path.join(self.directory, name), (timestamp, timestamp))
+
+    def test_status_links_to_the_admin_download(self):
+        response = self.client.get(reverse('administration:export_status', args=['task']))
+        self.assertEqual(response.json(), {
+            'status': 'ready', 'url': reverse('administration:export_download', args=['task'])
+        })
+        response = self.client.get(reverse('administration:export_download', args=['task']))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'%PDF')
+        self.assertIn('attachment', response['Content-Disposition'])
+
+    def test_download_requires_an_admin(self):
+        self.client.force_login(User.objects.create_user('10000000000001', 'Student'))
+        response = self.client.get(reverse('administration:export_download', args=['task']))
+        self.assertNotEqual(response.status_code, 200)
+
+    def test_download_rejects_names_outside_the_export_directory(self):
+        self.result.result = '../settings.py'
+        response = self.client.get(reverse('administration:export_download', args=['task']))
+        self.assertEqual(response.status_code, 404)
+
+    def test_expired_exports_are_refused_and_purged(self):
+        self.age(self.name, 25)
+        fresh = get_export_storage().save('exports/reports_fresh.pdf', ContentFile(b'%PDF'))
+        response = self.client.get(reverse('administration:export_status', args=['task']))
+        self.assertEqual(response.status_code, 410)
+        response = self.client.get(reverse('administration:export_download', args=['task']))
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(purge_expired_exports(), 1)
+        self.assertFalse(get_export_storage().exists(self.name))
+        self.assertTrue(get_export_storage().exists(fresh))
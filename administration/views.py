@@ -1,62 +1,117 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
-from django.db.models import Count, Avg, Q, Max, Min, Value
-from django.db import models
+from django.db.models import Count, Avg, Q, Max, Min, Sum, Prefetch, F
+from django.db import IntegrityError, connection, models, transaction
 from django.utils import timezone
-from django.http import JsonResponse, HttpResponse
-from django.core.paginator import Paginator
-from datetime import datetime, timedelta
-import openpyxl
-from openpyxl.styles import Font, Alignment, PatternFill
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
-from reportlab.lib.units import inch
-import io
+from django.utils.dateparse import parse_datetime
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
+from django.http import FileResponse, Http404, JsonResponse, HttpResponse, StreamingHttpResponse
+from django.core.exceptions import ValidationError
+from django.urls import reverse
+from datetime import datetime
+import csv
+import os
+from celery.result import AsyncResult
 
 from authentication.models import User
 from exams.models import Course, Exam, Question, UserExam, ExamSession, UserHistory
 from .models import Interface, UserInterfaceAccess
+from .pagination import CachedCountPaginator, KeysetPaginator
+from .services import (
+    get_cached_export,
+    get_course_choices,
+    get_course_suggestions,
+    get_dashboard_stats,
+    get_exam_choices,
+    get_interfaces,
+    invalidate_interface_access,
+)
+from .exports import (
+    assignment_counts,
+    build_reports_pdf,
+    build_reports_workbook,
+    build_user_history_pdf,
+    build_user_history_workbook,
+    user_history_rows,
+    workbook_bytes,
+)
+from .tasks import (
+    build_reports_pdf_file,
+    build_reports_xlsx,
+    build_user_history_pdf_file,
+    build_user_history_xlsx,
+    get_export_storage,
+    is_export_file,
+)
 from authentication.decorators import admin_required, get_user_interfaces
 
 
+# Per question type, build the answer fields from the submitted form
+QUESTION_TYPE_FIELDS = {
+    'multiple_choice': lambda data: {
+        'option_a': data.get('option_a', ''),
+        'option_b': data.get('option_b', ''),
+        'option_c': data.get('option_c', ''),
+        'option_d': data.get('option_d', ''),
+        'correct_answer': data.get('correct_answer'),
+    },
+    'true_false': lambda data: {
+        'option_a': 'True',
+        'option_b': 'False',
+        'correct_answer': data.get('correct_answer'),
+    },
+}
+
+
+def default_question_fields(data):
+    return {'correct_answer': data.get('correct_answer', '')}
+
+
 def is_admin(user):
     """Check if user is an admin."""
     return user.is_authenticated and user.is_admin
 
 
+def parse_form_datetime(value):
+    """Parse a datetime-local form value once, as an aware datetime or None."""
+    if not value:
+        return None
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValidationError(f'Invalid date/time: {value}')
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+class Echo:
+    """File-like object that returns what is written, for streaming csv.writer rows."""
+    def write(self, value):
+        return value
+
+
 @login_required
 @user_passes_test(is_admin)
 def dashboard_view(request):
     """Admin dashboard with statistics and recent activity."""
-    # Calculate statistics
-    total_users = User.objects.count()
-    active_users = User.objects.filter(is_active=True).count()
-    total_courses = Course.objects.count()
-    active_courses = Course.objects.filter(is_active=True).count()
-    total_exams = Exam.objects.count()
-    active_exams = Exam.objects.filter(
-        start_time__lte=timezone.now(),
-        end_time__gte=timezone.now()
-    ).count()
-    total_submissions = UserExam.objects.filter(exam_sessions__is_submitted=True).distinct().count()
-    completed_submissions = total_submissions
-    
-    # Recent submissions
-    recent_submissions = UserExam.objects.filter(
-        exam_sessions__is_submitted=True
-    ).select_related('user', 'exam').order_by('-exam_sessions__end_time')[:5]
+    # Tile counts are cached for a minute and dropped when an exam is submitted
+    stats = get_dashboard_stats()
+    
+    # Recent submissions, read from the sessions so each row is one submitted attempt
+    # Plain rows with only the three columns the card shows, joined in the same query
+    recent_submissions = ExamSession.objects.filter(
+        is_submitted=True
+    ).order_by('-end_time').values(
+        'end_time', 'user_exam__user__name', 'user_exam__exam__exam_title'
+    )[:5]
     
     # System alerts (placeholder)
     alerts = []
     
     # Check for exams ending soon
-    exams_ending_soon = Exam.objects.filter(
-        end_time__gte=timezone.now(),
-        end_time__lte=timezone.now() + timedelta(days=1)
-    ).count()
+    exams_ending_soon = stats['exams_ending_soon']
     
     if exams_ending_soon > 0:
         alerts.append({
@@ -66,10 +121,7 @@ def dashboard_view(request):
         })
     
     # Check for inactive users
-    inactive_users = User.objects.filter(
-        is_active=True,
-        last_login__lt=timezone.now() - timedelta(days=30)
-    ).count()
+    inactive_users = stats['inactive_users']
     
     if inactive_users > 0:
         alerts.append({
@@ -79,14 +131,14 @@ def dashboard_view(request):
         })
     
     context = {
-        'total_users': total_users,
-        'active_users': active_users,
-        'total_courses': total_courses,
-        'active_courses': active_courses,
-        'total_exams': total_exams,
-        'active_exams': active_exams,
-        'total_submissions': total_submissions,
-        'completed_submissions': completed_submissions,
+        'total_users': stats['total_users'],
+        'active_users': stats['active_users'],
+        'total_courses': stats['total_courses'],
+        'courses_with_open_exams': stats['courses_with_open_exams'],
+        'total_exams': stats['total_exams'],
+        'active_exams': stats['active_exams'],
+        'total_submissions': stats['total_submissions'],
+        'completed_submissions': stats['total_submissions'],
         'recent_submissions': recent_submissions,
         'alerts': alerts,
     }
@@ -98,7 +150,10 @@ def dashboard_view(request):
 @user_passes_test(is_admin)
 def user_list_view(request):
     """List all users with search and filter options."""
-    users = User.objects.all().order_by('-date_joined')
+    users = User.objects.values(
+        'id', 'name', 'national_id', 'position', 'is_active', 'is_admin',
+        'is_staff', 'last_login', 'date_joined'
+    )
     
     # Search functionality
     search_query = request.GET.get('search', '')
@@ -125,10 +180,11 @@ def user_list_view(request):
     elif status == 'inactive':
         users = users.filter(is_active=False)
     
-    # Pagination
-    paginator = Paginator(users, 20)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Keyset pagination on date_joined (no OFFSET scan, no COUNT query)
+    page_size = request.GET.get('page_size', '')
+    per_page = int(page_size) if page_size in ('10', '25', '50', '100') else 20
+    paginator = KeysetPaginator(users, per_page, 'date_joined')
+    page_obj = paginator.get_page(request.GET.get('after'), request.GET.get('before'))
     
     context = {
         'page_obj': page_obj,
@@ -156,21 +212,22 @@ def user_create_view(request):
         # Validate required fields
         if not name or not national_id:
             messages.error(request, 'Name and National ID are required.')
-        elif User.objects.filter(national_id=national_id).exists():
-            messages.error(request, 'A user with this National ID already exists.')
         else:
             try:
-                # Create new user
-                user = User.objects.create(
-                    name=name,
-                    national_id=national_id,
-                    position=position,
-                    is_staff=is_staff,
-                    is_admin=is_admin,
-                    is_active=is_active
-                )
+                # Create new user; the unique national_id column rejects duplicates
+                with transaction.atomic():
+                    user = User.objects.create_user(
+                        national_id,
+                        name,
+                        position=position,
+                        is_staff=is_staff,
+                        is_admin=is_admin,
+                        is_active=is_active
+                    )
                 messages.success(request, f'User {user.name} created successfully.')
                 return redirect('administration:user_list')
+            except IntegrityError:
+                messages.error(request, 'A user with this National ID already exists.')
             except Exception as e:
                 messages.error(request, f'Error creating user: {str(e)}')
     
@@ -194,7 +251,7 @@ def user_edit_view(request, user_id):
         user.is_staff = 'is_staff' in request.POST
         user.is_admin = 'is_admin' in request.POST
         user.is_active = 'is_active' in request.POST
-        user.save()
+        user.save(update_fields=['name', 'position', 'is_staff', 'is_admin', 'is_active'])
         
         messages.success(request, f'User {user.name} updated successfully.')
         return redirect('administration:user_list')
@@ -219,7 +276,7 @@ def user_toggle_status_view(request, user_id):
         return redirect('administration:user_list')
     
     user.is_active = not user.is_active
-    user.save()
+    user.save(update_fields=['is_active'])
     
     status = 'activated' if user.is_active else 'deactivated'
     messages.success(request, f'User {user.name} has been {status}.')
@@ -240,7 +297,7 @@ def user_delete_view(request, user_id):
     if request.method == 'POST':
         # Soft delete by deactivating
         user.is_active = False
-        user.save()
+        user.save(update_fields=['is_active'])
         messages.success(request, f'User {user.name} has been deleted (deactivated).')
         return redirect('administration:user_list')
     
@@ -256,7 +313,9 @@ def user_delete_view(request, user_id):
 @user_passes_test(is_admin)
 def course_list_view(request):
     """List all courses."""
-    courses = Course.objects.all().order_by('-created_at')
+    courses = Course.objects.annotate(exam_count=Count('exams')).values(
+        'course_id', 'course_name', 'description', 'created_at', 'exam_count'
+    ).order_by('-created_at')
     
     # Search functionality
     search_query = request.GET.get('search', '')
@@ -267,7 +326,7 @@ def course_list_view(request):
         )
     
     # Pagination
-    paginator = Paginator(courses, 15)
+    paginator = CachedCountPaginator(courses, 15)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     
@@ -287,12 +346,8 @@ def course_suggestions_api(request):
     suggestions = []
     
     if query and len(query) >= 2:
-        # Get existing course names that match the query
-        courses = Course.objects.filter(
-            course_name__icontains=query
-        ).values_list('course_name', flat=True).distinct()[:10]
-        
-        suggestions = list(courses)
+        # Prefix matches come from the cache; a course save expires them
+        suggestions = get_course_suggestions(query)
         
         # Add some common course name patterns if no exact matches
         if not suggestions:
@@ -347,7 +402,7 @@ def course_edit_view(request, course_id):
             try:
                 course.course_name = course_name
                 course.description = description or ''
-                course.save()
+                course.save(update_fields=['course_name', 'description', 'updated_at'])
                 messages.success(request, f'Course "{course_name}" updated successfully!')
                 return redirect('administration:course_list')
             except Exception as e:
@@ -387,27 +442,23 @@ def course_delete_view(request, course_id):
 @user_passes_test(is_admin)
 def exam_list_view(request):
     """List all exams."""
-    exams = Exam.objects.select_related('course').order_by('-created_at')
+    exams = Exam.objects.select_related('course')
     
     # Search functionality
     search_query = request.GET.get('search', '')
     if search_query:
-        exams = exams.filter(
-            Q(exam_title__icontains=search_query) |
-            Q(course__course_name__icontains=search_query)
-        )
+        exams = exams.filter(search_blob__icontains=search_query)
     
     # Filter by course
     course_id = request.GET.get('course', '')
     if course_id:
         exams = exams.filter(course_id=course_id)
     
-    # Pagination
-    paginator = Paginator(exams, 15)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Keyset pagination on created_at (no OFFSET scan, no COUNT query)
+    paginator = KeysetPaginator(exams, 15, 'created_at')
+    page_obj = paginator.get_page(request.GET.get('after'), request.GET.get('before'))
     
-    courses = Course.objects.all().order_by('course_name')
+    courses = get_course_choices()
     
     context = {
         'page_obj': page_obj,
@@ -436,6 +487,8 @@ def exam_create_view(request):
         
         if exam_title and course_id and time_limit:
             try:
+                start_dt = parse_form_datetime(start_time)
+                end_dt = parse_form_datetime(end_time)
                 course = Course.objects.get(course_id=course_id)
                 exam = Exam.objects.create(
                     exam_title=exam_title,
@@ -445,8 +498,8 @@ def exam_create_view(request):
                     total_points=float(total_points) if total_points else None,
                     passing_score=int(passing_score) if passing_score else 60,
                     max_attempts=int(max_attempts) if max_attempts else 1,
-                    start_time=start_time if start_time else None,
-                    end_time=end_time if end_time else None
+                    start_time=start_dt,
+                    end_time=end_dt
                 )
                 messages.success(request, f'Exam "{exam_title}" created successfully!')
                 return redirect('administration:exam_list')
@@ -459,7 +512,7 @@ def exam_create_view(request):
         else:
             messages.error(request, 'All fields are required.')
     
-    courses = Course.objects.all().order_by('course_name')
+    courses = get_course_choices()
     context = {
         'title': 'Create Exam',
         'courses': courses
@@ -486,6 +539,8 @@ def exam_edit_view(request, exam_id):
         
         if exam_title and course_id and time_limit:
             try:
+                start_dt = parse_form_datetime(start_time)
+                end_dt = parse_form_datetime(end_time)
                 course = Course.objects.get(course_id=course_id)
                 exam.exam_title = exam_title
                 exam.course = course
@@ -496,10 +551,10 @@ def exam_edit_view(request, exam_id):
                 exam.max_attempts = int(max_attempts) if max_attempts else 1
                 
                 # Handle datetime fields
-                if start_time:
-                    exam.start_time = start_time
-                if end_time:
-                    exam.end_time = end_time
+                if start_dt:
+                    exam.start_time = start_dt
+                if end_dt:
+                    exam.end_time = end_dt
                     
                 exam.save()
                 messages.success(request, f'Exam "{exam_title}" updated successfully!')
@@ -513,7 +568,7 @@ def exam_edit_view(request, exam_id):
         else:
             messages.error(request, 'Title, course, and time limit are required.')
     
-    courses = Course.objects.all().order_by('course_name')
+    courses = get_course_choices()
     context = {
         'title': 'Edit Exam',
         'exam': exam,
@@ -547,7 +602,10 @@ def exam_delete_view(request, exam_id):
 @user_passes_test(is_admin)
 def question_list_view(request):
     """List all questions."""
-    questions = Question.objects.select_related('exam').order_by('-question_id')
+    questions = Question.objects.select_related('exam__course').only(
+        'question_id', 'question_text', 'question_type', 'option_a', 'correct_answer',
+        'points', 'exam__exam_title', 'exam__course__course_name'
+    ).order_by('-question_id')
     
     # Search functionality
     search_query = request.GET.get('search', '')
@@ -568,11 +626,11 @@ def question_list_view(request):
         questions = questions.filter(question_type=question_type)
     
     # Pagination
-    paginator = Paginator(questions, 20)
+    paginator = CachedCountPaginator(questions, 20)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     
-    exams = Exam.objects.all().order_by('exam_title')
+    exams = get_exam_choices()
     
     context = {
         'page_obj': page_obj,
@@ -599,32 +657,17 @@ def question_create_view(request):
             try:
                 exam = Exam.objects.get(exam_id=exam_id)
                 points = request.POST.get('points', 1.0)
-                question = Question.objects.create(
+                
+                # Type-specific fields go into the same INSERT
+                build_fields = QUESTION_TYPE_FIELDS.get(question_type, default_question_fields)
+                Question.objects.create(
                     exam=exam,
                     question_type=question_type,
                     question_text=question_text,
-                    points=float(points) if points else 1.0
+                    points=float(points) if points else 1.0,
+                    **build_fields(request.POST)
                 )
                 
-                # Handle different question types
-                if question_type == 'multiple_choice':
-                    question.option_a = request.POST.get('option_a', '')
-                    question.option_b = request.POST.get('option_b', '')
-                    question.option_c = request.POST.get('option_c', '')
-                    question.option_d = request.POST.get('option_d', '')
-                    question.correct_answer = request.POST.get('correct_answer')
-                    question.save()
-                    
-                elif question_type == 'true_false':
-                    question.option_a = 'True'
-                    question.option_b = 'False'
-                    question.correct_answer = request.POST.get('correct_answer')
-                    question.save()
-                    
-                else:
-                    question.correct_answer = request.POST.get('correct_answer', '')
-                    question.save()
-                
                 messages.success(request, f'Question created successfully!')
                 return redirect('administration:question_list')
                 
@@ -636,7 +679,7 @@ def question_create_view(request):
         else:
             messages.error(request, 'All required fields must be filled.')
     
-    exams = Exam.objects.select_related('course').order_by('exam_title')
+    exams = get_exam_choices()
     context = {
         'title': 'Create Question',
         'exams': exams
@@ -683,7 +726,7 @@ def assignment_create_view(request):
     
     # Get users and exams for the form
     users = User.objects.filter(is_active=True).order_by('name')
-    exams = Exam.objects.select_related('course').order_by('exam_title')
+    exams = get_exam_choices()
     
     context = {
         'title': 'Create Assignment',
@@ -697,7 +740,7 @@ def assignment_create_view(request):
 @user_passes_test(is_admin)
 def assignment_list_view(request):
     """List all exam assignments."""
-    assignments = UserExam.objects.select_related('user', 'exam', 'exam__course').prefetch_related('exam_sessions').order_by('-assigned_date')
+    assignments = UserExam.objects.select_related('user', 'exam', 'exam__course').order_by('-assigned_date')
     
     # Search functionality
     search_query = request.GET.get('search', '')
@@ -718,28 +761,21 @@ def assignment_list_view(request):
     if status_filter:
         if status_filter == 'completed':
             # Filter assignments that have submitted exam sessions
-            assignments = assignments.filter(exam_sessions__is_submitted=True).distinct()
+            assignments = assignments.filter(completion_state='completed')
         elif status_filter == 'pending':
             # Filter assignments that don't have submitted exam sessions
-            assignments = assignments.exclude(exam_sessions__is_submitted=True)
-    
-    # Add assignment_status annotation to assignments
-    from django.db.models import Case, When, Exists, OuterRef
-    
-    assignments = assignments.annotate(
-        assignment_status=Case(
-            When(Exists(ExamSession.objects.filter(user_exam=OuterRef('pk'), is_submitted=True)), then=Value('completed')),
-            default=Value('pending'),
-            output_field=models.CharField()
-        )
-    )
+            assignments = assignments.exclude(completion_state='completed')
     
     # Pagination
-    paginator = Paginator(assignments, 20)
+    paginator = CachedCountPaginator(assignments, 20)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     
-    exams = Exam.objects.all().order_by('exam_title')
+    # Status comes from the completion_state column, no session rows needed
+    for assignment in page_obj.object_list:
+        assignment.assignment_status = 'completed' if assignment.completion_state == 'completed' else 'pending'
+    
+    exams = get_exam_choices()
     
     context = {
         'page_obj': page_obj,
@@ -757,23 +793,38 @@ def assignment_list_view(request):
 def reports_view(request):
     """Generate and display various reports."""
     # Exam performance statistics
+    # Per-row count subqueries with a semi-join for completion, instead of
+    # COUNT(DISTINCT) over the assignment x session join
+    exam_counts = assignment_counts('exam')
     exam_stats = Exam.objects.annotate(
-        total_attempts=Count('user_assignments'),
-        completed_attempts=Count('user_assignments', filter=Q(user_assignments__exam_sessions__is_submitted=True)),
-        avg_score=Value(0.0)  # Placeholder - score calculation would need to be implemented
-    ).order_by('-created_at')[:10]
+        total_attempts=exam_counts['total_assigned'],
+        completed_attempts=exam_counts['total_completed']
+        # avg_score is not annotated: scores are not stored yet, so the template shows "No data"
+    ).select_related('course').order_by('-created_at')[:10]
     
     # User performance statistics
+    user_counts = assignment_counts('user')
     user_stats = User.objects.annotate(
-        total_exams=Count('assigned_exams'),
-        completed_exams=Count('assigned_exams', filter=Q(assigned_exams__exam_sessions__is_submitted=True)),
-        avg_score=Value(0.0)  # Placeholder - score calculation would need to be implemented
+        total_exams=user_counts['total_assigned'],
+        completed_exams=user_counts['total_completed']
     ).filter(is_admin=False).order_by('-total_exams')[:10]
     
-    # Recent activity
-    recent_sessions = ExamSession.objects.select_related(
-        'user_exam__user', 'user_exam__exam'
-    ).order_by('-start_time')[:20]
+    # Recent activity, with the assignment status read from the assignment
+    recent_sessions = ExamSession.objects.annotate(
+        assignment_status=F('user_exam__completion_state')
+    ).order_by('-start_time').values(
+        'start_time', 'end_time', 'assignment_status',
+        'user_exam__user__name', 'user_exam__user__national_id',
+        'user_exam__exam__exam_title', 'user_exam__exam__course__course_name'
+    )[:20]
+    
+    # Precompute rates once here instead of per-cell in the template
+    exam_stats = list(exam_stats)
+    for exam in exam_stats:
+        exam.success_rate = round(exam.completed_attempts * 100.0 / exam.total_attempts, 1) if exam.total_attempts else None
+    user_stats = list(user_stats)
+    for user in user_stats:
+        user.completion_rate = round(user.completed_exams * 100.0 / user.total_exams, 1) if user.total_exams else None
     
     context = {
         'exam_stats': exam_stats,
@@ -803,7 +854,7 @@ def user_history_view(request):
         )
     
     # Pagination
-    paginator = Paginator(sessions, 25)
+    paginator = CachedCountPaginator(sessions, 25)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     
@@ -826,13 +877,8 @@ def exam_results_view(request, exam_id):
     
     # Filter by status (based on exam sessions)
     status_filter = request.GET.get('status', '')
-    if status_filter:
-        if status_filter == 'completed':
-            user_exams = user_exams.filter(exam_sessions__is_submitted=True).distinct()
-        elif status_filter == 'in_progress':
-            user_exams = user_exams.filter(exam_sessions__is_submitted=False).distinct()
-        elif status_filter == 'not_started':
-            user_exams = user_exams.exclude(exam_sessions__isnull=False)
+    if status_filter in ('completed', 'in_progress', 'not_started'):
+        user_exams = user_exams.filter(completion_state=status_filter)
     
     # Filter by score range
     min_score = request.GET.get('min_score', '')
@@ -848,19 +894,29 @@ def exam_results_view(request, exam_id):
         except ValueError:
             pass
     
-    # Search by user name or national ID
-    search_query = request.GET.get('search', '')
+    # Search by user name or national ID. National IDs are all digits and
+    # names never are, so only one column is searched. Partial IDs match
+    # anywhere in the number; a full 14-digit ID uses the unique index
+    search_query = request.GET.get('search', '').strip()
     if search_query:
-        user_exams = user_exams.filter(
-            Q(user__name__icontains=search_query) |
-            Q(user__national_id__icontains=search_query)
-        )
-    
-    # Calculate statistics
-    total_attempts = user_exams.count()
-    completed_attempts = user_exams.filter(exam_sessions__is_submitted=True).distinct().count()
-    in_progress_attempts = user_exams.filter(exam_sessions__is_submitted=False).distinct().count()
-    not_started_attempts = user_exams.exclude(exam_sessions__isnull=False).count()
+        if search_query.isdigit() and len(search_query) == 14:
+            user_exams = user_exams.filter(user__national_id=search_query)
+        elif search_query.isdigit():
+            user_exams = user_exams.filter(user__national_id__icontains=search_query)
+        else:
+            user_exams = user_exams.filter(user__name__icontains=search_query)
+    
+    # Calculate statistics in one aggregate over the completion states
+    status_counts = user_exams.aggregate(
+        total=Count('pk'),
+        completed=Count('pk', filter=Q(completion_state='completed')),
+        in_progress=Count('pk', filter=Q(completion_state='in_progress')),
+        not_started=Count('pk', filter=Q(completion_state='not_started'))
+    )
+    total_attempts = status_counts['total']
+    completed_attempts = status_counts['completed']
+    in_progress_attempts = status_counts['in_progress']
+    not_started_attempts = status_counts['not_started']
     
     # Get completed exams with scores from exam sessions
     completed_sessions = ExamSession.objects.filter(
@@ -877,10 +933,15 @@ def exam_results_view(request, exam_id):
     passed_count = 0  # Will need to implement score calculation
     pass_rate = 0  # Will need to implement score calculation
     
-    # Pagination
-    paginator = Paginator(user_exams.order_by('-assigned_date'), 20)
+    # Paginate over ids only, then load the page's rows with their users
+    page_ids = user_exams.order_by('-assigned_date', '-pk').values_list('user_exam_id', flat=True)
+    paginator = CachedCountPaginator(page_ids, 20)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
+    page_obj.object_list = list(
+        UserExam.objects.filter(user_exam_id__in=list(page_obj.object_list))
+        .select_related('user').with_attempts().order_by('-assigned_date', '-pk')
+    )
     
     context = {
         'exam': exam,
@@ -906,43 +967,51 @@ def user_exam_detail_view(request, user_exam_id):
     """View detailed results for a specific user's exam attempt."""
     user_exam = get_object_or_404(UserExam, user_exam_id=user_exam_id)
     
-    # Get the exam session
+    # Get the exam session; only its key is used, to select the answers
     try:
-        session = ExamSession.objects.get(user_exam=user_exam)
+        session = ExamSession.objects.only('session_id').get(user_exam=user_exam)
     except ExamSession.DoesNotExist:
         session = None
     
-    # Get user's answers
+    # Get user's answers, counting as each row is built
     user_answers = []
+    answered_questions = correct_answers = earned_points = 0
     if session:
-        answers = UserHistory.objects.filter(session=session).select_related('question')
-        for answer in answers:
-            is_correct = False
-            points_earned = 0
-            
-            if answer.question.question_type == 'multiple_choice':
-                is_correct = answer.selected_answer == answer.question.correct_answer
-                points_earned = answer.question.points if is_correct else 0
-            elif answer.question.question_type == 'true_false':
-                is_correct = answer.selected_answer == answer.question.correct_answer
-                points_earned = answer.question.points if is_correct else 0
+        # Plain rows: only the answer and question columns used below
+        answers = UserHistory.objects.filter(session=session).values(
+            'question_id', 'answer_given',
+            'question__question_text', 'question__question_type',
+            'question__correct_answer', 'question__points'
+        )
+        for row in answers:
+            correct_answer = row['question__correct_answer']
             # For short_answer and essay, manual grading would be needed
+            is_correct = (
+                row['question__question_type'] in ('multiple_choice', 'true_false')
+                and row['answer_given'] == correct_answer
+            )
+            points_earned = row['question__points'] if is_correct else 0
+            if row['answer_given']:
+                answered_questions += 1
+            if is_correct:
+                correct_answers += 1
+            earned_points += points_earned
             
             user_answers.append({
-                'question': answer.question,
-                'user_answer': answer.selected_answer or answer.answer_text,
-                'correct_answer': answer.question.correct_answer,
+                'question_id': row['question_id'],
+                'question_text': row['question__question_text'],
+                'question_type': row['question__question_type'],
+                'points': row['question__points'],
+                'user_answer': row['answer_given'],
+                'correct_answer': correct_answer,
                 'is_correct': is_correct,
                 'points_earned': points_earned,
-                'answer_obj': answer
             })
     
     # Calculate detailed statistics
-    total_questions = user_exam.exam.questions.count()
-    answered_questions = len([a for a in user_answers if a['user_answer']])
-    correct_answers = len([a for a in user_answers if a['is_correct']])
-    total_points = sum(q.points for q in user_exam.exam.questions.all())
-    earned_points = sum(a['points_earned'] for a in user_answers)
+    question_totals = user_exam.exam.questions.aggregate(count=Count('pk'), points=Sum('points'))
+    total_questions = question_totals['count']
+    total_points = question_totals['points'] or 0
     
     context = {
         'user_exam': user_exam,
@@ -965,15 +1034,20 @@ def individual_user_history_view(request, user_id):
     user = get_object_or_404(User, id=user_id)
     
     # Get user's exam history
-    user_exams = UserExam.objects.filter(user=user).select_related('exam', 'exam__course').order_by('-assigned_date')
+    user_exams = UserExam.objects.filter(user=user).select_related('exam', 'exam__course').with_attempts().order_by('-assigned_date')
     
     # Get user's exam sessions
     sessions = ExamSession.objects.filter(user_exam__user=user).select_related('user_exam__exam').order_by('-start_time')
     
     # Calculate user statistics
-    total_assigned = user_exams.count()
-    total_completed = user_exams.filter(exam_sessions__is_submitted=True).distinct().count()
-    total_in_progress = user_exams.filter(exam_sessions__isnull=False, exam_sessions__is_submitted=False).distinct().count()
+    state_counts = UserExam.objects.filter(user=user).aggregate(
+        total=Count('pk'),
+        completed=Count('pk', filter=Q(completion_state='completed')),
+        in_progress=Count('pk', filter=Q(completion_state='in_progress'))
+    )
+    total_assigned = state_counts['total']
+    total_completed = state_counts['completed']
+    total_in_progress = state_counts['in_progress']
     total_not_started = total_assigned - total_completed - total_in_progress
     
     # Note: Score calculation would need to be implemented and stored
@@ -1005,7 +1079,13 @@ def individual_user_history_view(request, user_id):
 @admin_required
 def interface_list_view(request):
     """Display list of all interfaces"""
-    interfaces = Interface.objects.all().order_by('module_name', 'function')
+    # Load only the granted rows, with the cached user name, instead of full access and user objects
+    granted_access = UserInterfaceAccess.objects.filter(has_access=True).only(
+        'access_id', 'interface_id', 'user_name_cache'
+    ).order_by('user_name_cache')
+    interfaces = Interface.objects.prefetch_related(
+        Prefetch('user_access', queryset=granted_access, to_attr='granted_access')
+    ).order_by('module_name', 'function')
     
     return render(request, 'administration/interface_list.html', {
         'interfaces': interfaces,
@@ -1043,32 +1123,56 @@ def interface_create_view(request):
 def user_interface_access_view(request, user_id):
     """Manage interface access for a specific user"""
     user = get_object_or_404(User, pk=user_id)
-    interfaces = Interface.objects.all().order_by('module_name', 'function')
+    interfaces = get_interfaces()
     
-    # Get current user access
-    user_access = {}
-    for access in UserInterfaceAccess.objects.filter(user=user):
-        user_access[access.interface.interface_id] = access.has_access
+    # Get current user access as a set of granted interface ids
+    granted_interfaces = frozenset(
+        UserInterfaceAccess.objects.filter(user=user, has_access=True)
+        .values_list('interface_id', flat=True)
+    )
     
     if request.method == 'POST':
         # Update interface access
         selected_interfaces = request.POST.getlist('interfaces')
         
-        # Remove all existing access for this user
-        UserInterfaceAccess.objects.filter(user=user).delete()
+        # Unknown ids are dropped by the filter instead of being looked up one by one
+        selected = dict(
+            Interface.objects.filter(interface_id__in=selected_interfaces)
+            .values_list('interface_id', 'module_name')
+        )
+        current = dict(
+            UserInterfaceAccess.objects.filter(user=user)
+            .values_list('interface_id', 'has_access')
+        )
         
-        # Add new access records
-        for interface_id in selected_interfaces:
-            try:
-                interface = Interface.objects.get(interface_id=interface_id)
-                UserInterfaceAccess.objects.create(
-                    user=user,
-                    interface=interface,
-                    has_access=True,
-                    granted_by=request.user
+        # Only touch the rows that differ, so unchanged grants keep their
+        # original granted_date and granted_by
+        to_remove = current.keys() - selected.keys()
+        to_regrant = [interface_id for interface_id in selected if current.get(interface_id) is False]
+        to_add = selected.keys() - current.keys()
+        now = timezone.now()
+        with transaction.atomic():
+            if to_remove:
+                UserInterfaceAccess.objects.filter(user=user, interface_id__in=to_remove).delete()
+            if to_regrant:
+                UserInterfaceAccess.objects.filter(user=user, interface_id__in=to_regrant).update(
+                    has_access=True, granted_by=request.user, granted_date=now
                 )
-            except Interface.DoesNotExist:
-                continue
+            if to_add:
+                UserInterfaceAccess.objects.bulk_create([
+                    UserInterfaceAccess(
+                        user=user,
+                        interface_id=interface_id,
+                        has_access=True,
+                        granted_by=request.user,
+                        granted_date=now,
+                        user_name_cache=user.name,
+                        interface_module_cache=selected[interface_id]
+                    )
+                    for interface_id in to_add
+                ])
+        # update() and bulk_create() send no signals, so expire the cached grants here
+        invalidate_interface_access([user.pk])
         
         messages.success(request, f'Interface access updated for {user.name}.')
         return redirect('administration:user_list')
@@ -1076,7 +1180,7 @@ def user_interface_access_view(request, user_id):
     return render(request, 'administration/user_interface_access.html', {
         'user_obj': user,
         'interfaces': interfaces,
-        'user_access': user_access,
+        'granted_interfaces': granted_interfaces,
     })
 
 
@@ -1085,7 +1189,7 @@ def user_interface_access_view(request, user_id):
 def bulk_interface_access_view(request):
     """Manage interface access for multiple users"""
     users = User.objects.filter(is_active=True).order_by('name')
-    interfaces = Interface.objects.all().order_by('module_name', 'function')
+    interfaces = get_interfaces()
     
     if request.method == 'POST':
         selected_users = request.POST.getlist('users')
@@ -1093,39 +1197,50 @@ def bulk_interface_access_view(request):
         action = request.POST.get('action')  # 'grant' or 'revoke'
         
         if selected_users and selected_interfaces and action:
-            updated_count = 0
+            target_users = list(User.objects.filter(pk__in=selected_users).only('id', 'name'))
+            target_interfaces = list(Interface.objects.filter(interface_id__in=selected_interfaces).only('interface_id', 'module_name'))
             
-            for user_id in selected_users:
-                try:
-                    user = User.objects.get(pk=user_id)
-                    
-                    for interface_id in selected_interfaces:
-                        try:
-                            interface = Interface.objects.get(interface_id=interface_id)
-                            
-                            # Get or create access record
-                            access, created = UserInterfaceAccess.objects.get_or_create(
-                                user=user,
-                                interface=interface,
-                                defaults={
-                                    'has_access': action == 'grant',
-                                    'granted_by': request.user
-                                }
-                            )
-                            
-                            if not created:
-                                access.has_access = action == 'grant'
-                                access.granted_by = request.user
-                                access.granted_date = timezone.now()
-                                access.save()
-                            
-                            updated_count += 1
-                            
-                        except Interface.DoesNotExist:
-                            continue
-                            
-                except User.DoesNotExist:
-                    continue
+            # Upsert every (user, interface) pair in a single statement per batch
+            has_access = action == 'grant'
+            now = timezone.now()
+            access_records = [
+                UserInterfaceAccess(
+                    user=user,
+                    interface=interface,
+                    has_access=has_access,
+                    granted_by=request.user,
+                    granted_date=now,
+                    user_name_cache=user.name,
+                    interface_module_cache=interface.module_name
+                )
+                for user in target_users
+                for interface in target_interfaces
+            ]
+            with transaction.atomic():
+                if connection.features.supports_update_conflicts_with_target:
+                    UserInterfaceAccess.objects.bulk_create(
+                        access_records,
+                        update_conflicts=True,
+                        unique_fields=['user', 'interface'],
+                        update_fields=['has_access', 'granted_date', 'granted_by'],
+                        batch_size=1000
+                    )
+                else:
+                    # No ON CONFLICT target (e.g. SQL Server): update the existing
+                    # pairs, then insert only the pairs that have no row yet
+                    existing = UserInterfaceAccess.objects.filter(user__in=target_users, interface__in=target_interfaces)
+                    existing_pairs = set(existing.values_list('user_id', 'interface_id'))
+                    existing.update(has_access=has_access, granted_date=now, granted_by=request.user)
+                    UserInterfaceAccess.objects.bulk_create(
+                        [
+                            record for record in access_records
+                            if (record.user_id, record.interface_id) not in existing_pairs
+                        ],
+                        ignore_conflicts=connection.features.supports_ignore_conflicts,
+                        batch_size=1000
+                    )
+            # bulk_create sends no signals, so expire the cached grants here
+            invalidate_interface_access(selected_users)
             
             action_text = 'granted' if action == 'grant' else 'revoked'
             messages.success(request, f'Interface access {action_text} for {len(selected_users)} users across {len(selected_interfaces)} interfaces.')
@@ -1143,82 +1258,27 @@ def bulk_interface_access_view(request):
 @user_passes_test(is_admin)
 def export_user_history_excel(request, user_id):
     """Export user history to Excel format"""
-    user = get_object_or_404(User, user_id=user_id)
-    
-    # Get user exam history
-    user_exams = UserExam.objects.filter(user=user).select_related('exam', 'exam__course').order_by('-assigned_date')
-    
-    # Create workbook and worksheet
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = f"User History - {user.full_name}"
-    
-    # Define styles
-    header_font = Font(bold=True, color="FFFFFF")
-    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-    header_alignment = Alignment(horizontal="center", vertical="center")
-    
-    # Add title
-    ws.merge_cells('A1:G1')
-    title_cell = ws['A1']
-    title_cell.value = f"Exam History Report - {user.full_name}"
-    title_cell.font = Font(bold=True, size=16)
-    title_cell.alignment = Alignment(horizontal="center")
-    
-    # Add user info
-    ws['A3'] = "National ID:"
-    ws['B3'] = user.national_id
-    ws['A4'] = "Email:"
-    ws['B4'] = user.email
-    ws['A5'] = "Generated:"
-    ws['B5'] = timezone.now().strftime('%Y-%m-%d %H:%M:%S')
-    
-    # Add headers
-    headers = ['Exam Name', 'Course', 'Status', 'Assigned Date', 'Due Date', 'Attempts', 'Score']
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=7, column=col)
-        cell.value = header
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = header_alignment
-    
-    # Add data
-    for row, user_exam in enumerate(user_exams, 8):
-        ws.cell(row=row, column=1, value=user_exam.exam.title)
-        ws.cell(row=row, column=2, value=user_exam.exam.course.name)
-        ws.cell(row=row, column=3, value=user_exam.status.title())
-        ws.cell(row=row, column=4, value=user_exam.assigned_date.strftime('%Y-%m-%d'))
-        ws.cell(row=row, column=5, value=user_exam.due_date.strftime('%Y-%m-%d') if user_exam.due_date else 'No due date')
-        ws.cell(row=row, column=6, value=user_exam.get_attempts_taken())
-        
-        # Get best score
-        best_session = ExamSession.objects.filter(
-            user_exam=user_exam, 
-            submitted_at__isnull=False
-        ).order_by('-score').first()
-        score = f"{best_session.score}%" if best_session and best_session.score is not None else "Not taken"
-        ws.cell(row=row, column=7, value=score)
-    
-    # Auto-adjust column widths
-    for column in ws.columns:
-        max_length = 0
-        column_letter = column[0].column_letter
-        for cell in column:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        adjusted_width = min(max_length + 2, 50)
-        ws.column_dimensions[column_letter].width = adjusted_width
+    user = get_object_or_404(User, pk=user_id)
+    
+    if request.GET.get('background'):
+        task = build_user_history_xlsx.delay(user.pk)
+        return JsonResponse({
+            'task_id': task.id,
+            'poll_url': reverse('administration:export_status', args=[task.id]),
+        })
+    
+    content = get_cached_export(
+        f'user_history_xlsx:{user.pk}',
+        lambda: workbook_bytes(build_user_history_workbook(user))
+    )
     
     # Create response
     response = HttpResponse(
+        content,
         content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
     )
     response['Content-Disposition'] = f'attachment; filename="user_history_{user.national_id}_{timezone.now().strftime("%Y%m%d")}.xlsx"'
     
-    wb.save(response)
     return response
 
 
@@ -1226,100 +1286,45 @@ def export_user_history_excel(request, user_id):
 @user_passes_test(is_admin)
 def export_user_history_pdf(request, user_id):
     """Export user history to PDF format"""
-    user = get_object_or_404(User, user_id=user_id)
-    
-    # Get user exam history
-    user_exams = UserExam.objects.filter(user=user).select_related('exam', 'exam__course').order_by('-assigned_date')
-    
-    # Create PDF buffer
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
-    
-    # Container for the 'Flowable' objects
-    elements = []
-    
-    # Define styles
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=18,
-        spaceAfter=30,
-        alignment=1  # Center alignment
-    )
+    user = get_object_or_404(User, pk=user_id)
+    now = timezone.now()
     
-    # Add title
-    title = Paragraph(f"Exam History Report - {user.full_name}", title_style)
-    elements.append(title)
-    
-    # Add user info
-    user_info = [
-        ["National ID:", user.national_id],
-        ["Email:", user.email],
-        ["Generated:", timezone.now().strftime('%Y-%m-%d %H:%M:%S')]
-    ]
-    
-    user_info_table = Table(user_info, colWidths=[2*inch, 4*inch])
-    user_info_table.setStyle(TableStyle([
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-    ]))
-    elements.append(user_info_table)
-    elements.append(Spacer(1, 20))
-    
-    # Prepare exam data
-    data = [['Exam Name', 'Course', 'Status', 'Assigned', 'Due Date', 'Attempts', 'Score']]
-    
-    for user_exam in user_exams:
-        # Get best score
-        best_session = ExamSession.objects.filter(
-            user_exam=user_exam, 
-            submitted_at__isnull=False
-        ).order_by('-score').first()
-        score = f"{best_session.score}%" if best_session and best_session.score is not None else "Not taken"
-        
-        data.append([
-            user_exam.exam.title[:20] + '...' if len(user_exam.exam.title) > 20 else user_exam.exam.title,
-            user_exam.exam.course.name[:15] + '...' if len(user_exam.exam.course.name) > 15 else user_exam.exam.course.name,
-            user_exam.status.title(),
-            user_exam.assigned_date.strftime('%Y-%m-%d'),
-            user_exam.due_date.strftime('%Y-%m-%d') if user_exam.due_date else 'No due date',
-            str(user_exam.get_attempts_taken()),
-            score
-        ])
-    
-    # Create table
-    table = Table(data, colWidths=[1.5*inch, 1.2*inch, 0.8*inch, 0.8*inch, 0.8*inch, 0.6*inch, 0.7*inch])
-    table.setStyle(TableStyle([
-        # Header style
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#366092')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        
-        # Body style
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 8),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.beige, colors.white]),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
+    if request.GET.get('background'):
+        task = build_user_history_pdf_file.delay(user.pk)
+        return JsonResponse({
+            'task_id': task.id,
+            'poll_url': reverse('administration:export_status', args=[task.id]),
+        })
     
-    elements.append(table)
+    pdf = get_cached_export(f'user_history_pdf:{user.pk}', lambda: build_user_history_pdf(user))
     
-    # Build PDF
-    doc.build(elements)
+    response = HttpResponse(pdf, content_type='application/pdf')
+    response['Content-Disposition'] = f'attachment; filename="user_history_{user.national_id}_{now.strftime("%Y%m%d")}.pdf"'
     
-    # Get the value of the BytesIO buffer and write it to the response
-    pdf = buffer.getvalue()
-    buffer.close()
+    return response
+
+
+@login_required
+@user_passes_test(is_admin)
+def export_user_history_csv(request, user_id):
+    """Stream user history as CSV"""
+    user = get_object_or_404(User, pk=user_id)
+    
+    def rows():
+        yield ['Exam Name', 'Course', 'Status', 'Assigned Date', 'Due Date', 'Attempts']
+        for exam_title, course_name, status, assigned_date, due_date, attempts in user_history_rows(user):
+            yield [
+                exam_title,
+                course_name,
+                status,
+                assigned_date.strftime('%Y-%m-%d'),
+                due_date.strftime('%Y-%m-%d') if due_date else 'No due date',
+                attempts,
+            ]
     
-    response = HttpResponse(content_type='application/pdf')
-    response['Content-Disposition'] = f'attachment; filename="user_history_{user.national_id}_{timezone.now().strftime("%Y%m%d")}.pdf"'
-    response.write(pdf)
+    writer = csv.writer(Echo())
+    response = StreamingHttpResponse((writer.writerow(row) for row in rows()), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="user_history_{user.national_id}_{timezone.now().strftime("%Y%m%d")}.csv"'
     
     return response
 
@@ -1328,174 +1333,22 @@ def export_user_history_pdf(request, user_id):
 @user_passes_test(is_admin)
 def export_reports_excel(request):
     """Export reports data to Excel format"""
+    if request.GET.get('background'):
+        task = build_reports_xlsx.delay()
+        return JsonResponse({
+            'task_id': task.id,
+            'poll_url': reverse('administration:export_status', args=[task.id]),
+        })
     
-    # Get exam performance data
-    exams = Exam.objects.annotate(
-        total_assigned=Count('user_assignments'),
-        total_completed=Count('user_assignments__exam_sessions', filter=Q(user_assignments__exam_sessions__is_submitted=True))
-        # Note: Score is calculated but not stored in ExamSession model
-    ).select_related('course')
-    
-    # Get user performance data
-    users = User.objects.annotate(
-        total_assigned=Count('assigned_exams'),
-        total_completed=Count('assigned_exams__exam_sessions', filter=Q(assigned_exams__exam_sessions__is_submitted=True))
-        # Note: Score is calculated but not stored in ExamSession model
-    )
-    
-    # Get recent activity
-    recent_sessions = ExamSession.objects.filter(
-        is_submitted=True
-    ).select_related('user_exam__user', 'user_exam__exam').order_by('-end_time')[:20]
-    
-    # Create workbook
-    wb = openpyxl.Workbook()
-    
-    # Define styles
-    header_font = Font(bold=True, color="FFFFFF")
-    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-    header_alignment = Alignment(horizontal="center", vertical="center")
-    
-    # Sheet 1: Exam Performance
-    ws1 = wb.active
-    ws1.title = "Exam Performance"
-    
-    # Add title
-    ws1.merge_cells('A1:F1')
-    title_cell = ws1['A1']
-    title_cell.value = "Exam Performance Report"
-    title_cell.font = Font(bold=True, size=16)
-    title_cell.alignment = Alignment(horizontal="center")
-    
-    # Add generation date
-    ws1['A3'] = "Generated:"
-    ws1['B3'] = timezone.now().strftime('%Y-%m-%d %H:%M:%S')
-    
-    # Add headers
-    exam_headers = ['Exam Name', 'Course', 'Total Assigned', 'Total Completed', 'Completion Rate', 'Average Score']
-    for col, header in enumerate(exam_headers, 1):
-        cell = ws1.cell(row=5, column=col)
-        cell.value = header
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = header_alignment
-    
-    # Add exam data
-    for row, exam in enumerate(exams, 6):
-        ws1.cell(row=row, column=1, value=exam.exam_title)
-        ws1.cell(row=row, column=2, value=exam.course.course_name)
-        ws1.cell(row=row, column=3, value=exam.total_assigned or 0)
-        ws1.cell(row=row, column=4, value=exam.total_completed or 0)
-        completion_rate = (exam.total_completed / exam.total_assigned * 100) if exam.total_assigned > 0 else 0
-        ws1.cell(row=row, column=5, value=f"{completion_rate:.1f}%")
-        # Since score is not stored in ExamSession, we can't calculate average score here
-        ws1.cell(row=row, column=6, value="N/A")
-    
-    # Sheet 2: User Performance
-    ws2 = wb.create_sheet("User Performance")
-    
-    # Add title
-    ws2.merge_cells('A1:F1')
-    title_cell = ws2['A1']
-    title_cell.value = "User Performance Report"
-    title_cell.font = Font(bold=True, size=16)
-    title_cell.alignment = Alignment(horizontal="center")
-    
-    # Add generation date
-    ws2['A3'] = "Generated:"
-    ws2['B3'] = timezone.now().strftime('%Y-%m-%d %H:%M:%S')
-    
-    # Add headers
-    user_headers = ['Full Name', 'National ID', 'Total Assigned', 'Total Completed', 'Completion Rate', 'Average Score']
-    for col, header in enumerate(user_headers, 1):
-        cell = ws2.cell(row=5, column=col)
-        cell.value = header
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = header_alignment
-    
-    # Add user data
-    for row, user in enumerate(users, 6):
-        ws2.cell(row=row, column=1, value=user.name)
-        ws2.cell(row=row, column=2, value=user.national_id)
-        ws2.cell(row=row, column=3, value=user.total_assigned or 0)
-        ws2.cell(row=row, column=4, value=user.total_completed or 0)
-        completion_rate = (user.total_completed / user.total_assigned * 100) if user.total_assigned > 0 else 0
-        ws2.cell(row=row, column=5, value=f"{completion_rate:.1f}%")
-        # Since score is not stored in ExamSession, we can't calculate average score here
-        ws2.cell(row=row, column=6, value="N/A")
-    
-    # Sheet 3: Recent Activity
-    ws3 = wb.create_sheet("Recent Activity")
-    
-    # Add title
-    ws3.merge_cells('A1:E1')
-    title_cell = ws3['A1']
-    title_cell.value = "Recent Activity Report"
-    title_cell.font = Font(bold=True, size=16)
-    title_cell.alignment = Alignment(horizontal="center")
-    
-    # Add generation date
-    ws3['A3'] = "Generated:"
-    ws3['B3'] = timezone.now().strftime('%Y-%m-%d %H:%M:%S')
-    
-    # Add headers
-    activity_headers = ['User', 'Exam', 'Score', 'Submitted Date', 'Duration']
-    for col, header in enumerate(activity_headers, 1):
-        cell = ws3.cell(row=5, column=col)
-        cell.value = header
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = header_alignment
-    
-    # Add activity data
-    for row, session in enumerate(recent_sessions, 6):
-        ws3.cell(row=row, column=1, value=session.user_exam.user.name)
-        ws3.cell(row=row, column=2, value=session.user_exam.exam.exam_title)
-        ws3.cell(row=row, column=3, value="N/A")  # Score is calculated but not stored in ExamSession
-        ws3.cell(row=row, column=4, value=session.end_time.strftime('%Y-%m-%d %H:%M') if session.end_time else "N/A")
-        
-        # Calculate duration
-        if session.start_time and session.end_time:
-            duration = session.end_time - session.start_time
-            hours, remainder = divmod(duration.total_seconds(), 3600)
-            minutes, _ = divmod(remainder, 60)
-            duration_str = f"{int(hours)}h {int(minutes)}m"
-        else:
-            duration_str = "N/A"
-        ws3.cell(row=row, column=5, value=duration_str)
-    
-    # Auto-adjust column widths for all sheets
-    for ws in [ws1, ws2, ws3]:
-        for column in ws.columns:
-            max_length = 0
-            # Skip empty columns
-            if not column:
-                continue
-                
-            # Handle potential merged cells
-            try:
-                column_letter = column[0].column_letter
-            except AttributeError:
-                # Skip cells without column_letter attribute (like merged cells)
-                continue
-                
-            for cell in column:
-                try:
-                    if cell.value and len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
+    content = get_cached_export('reports_xlsx', lambda: workbook_bytes(build_reports_workbook()))
     
     # Create response
     response = HttpResponse(
+        content,
         content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
     )
     response['Content-Disposition'] = f'attachment; filename="reports_{timezone.now().strftime("%Y%m%d")}.xlsx"'
     
-    wb.save(response)
     return response
 
 
@@ -1503,211 +1356,115 @@ def export_reports_excel(request):
 @user_passes_test(is_admin)
 def export_reports_pdf(request):
     """Export reports data to PDF format"""
+    now = timezone.now()
     
-    # Get exam performance data
-    exams = Exam.objects.annotate(
-        total_assigned=Count('user_assignments'),
-        total_completed=Count('user_assignments__exam_sessions', filter=Q(user_assignments__exam_sessions__is_submitted=True))
-        # Note: Score is calculated but not stored in ExamSession model
-    ).select_related('course')[:10]  # Limit for PDF
-    
-    # Get user performance data
-    users = User.objects.annotate(
-        total_assigned=Count('assigned_exams'),
-        total_completed=Count('assigned_exams__exam_sessions', filter=Q(assigned_exams__exam_sessions__is_submitted=True))
-        # Note: Score is calculated but not stored in ExamSession model
-    )[:10]  # Limit for PDF
-    
-    # Get recent activity
-    recent_sessions = ExamSession.objects.filter(
-        is_submitted=True
-    ).select_related('user_exam__user', 'user_exam__exam').order_by('-end_time')[:10]
-    
-    # Create PDF buffer
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
-    
-    # Container for the 'Flowable' objects
-    elements = []
-    
-    # Define styles
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=18,
-        spaceAfter=30,
-        alignment=1  # Center alignment
-    )
+    if request.GET.get('background'):
+        task = build_reports_pdf_file.delay()
+        return JsonResponse({
+            'task_id': task.id,
+            'poll_url': reverse('administration:export_status', args=[task.id]),
+        })
+    
+    pdf = get_cached_export('reports_pdf', build_reports_pdf)
     
-    section_style = ParagraphStyle(
-        'SectionTitle',
-        parent=styles['Heading2'],
-        fontSize=14,
-        spaceAfter=12,
-        spaceBefore=20
+    response = HttpResponse(pdf, content_type='application/pdf')
+    response['Content-Disposition'] = f'attachment; filename="reports_{now.strftime("%Y%m%d")}.pdf"'
+    
+    return response
+
+
+@login_required
+@user_passes_test(is_admin)
+def export_reports_csv(request):
+    """Stream exam performance data as CSV"""
+    exams = Exam.objects.annotate(**assignment_counts('exam')).order_by('exam_title').values_list(
+        'exam_title', 'course__course_name', 'total_assigned', 'total_completed'
     )
     
-    # Add title
-    title = Paragraph("System Reports & Analytics", title_style)
-    elements.append(title)
-    
-    # Add generation info
-    gen_info = Paragraph(f"Generated: {timezone.now().strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal'])
-    elements.append(gen_info)
-    elements.append(Spacer(1, 20))
-    
-    # Exam Performance Section
-    elements.append(Paragraph("Exam Performance", section_style))
-    
-    exam_data = [['Exam Name', 'Course', 'Assigned', 'Completed', 'Rate', 'Avg Score']]
-    for exam in exams:
-        completion_rate = (exam.total_completed / exam.total_assigned * 100) if exam.total_assigned > 0 else 0
-        # Since score is not stored in ExamSession, we can't calculate average score
-        exam_data.append([
-            exam.exam_title[:15] + '...' if len(exam.exam_title) > 15 else exam.exam_title,
-            exam.course.course_name[:12] + '...' if len(exam.course.course_name) > 12 else exam.course.course_name,
-            str(exam.total_assigned or 0),
-            str(exam.total_completed or 0),
-            f"{completion_rate:.1f}%",
-            "N/A"
-        ])
-    
-    exam_table = Table(exam_data, colWidths=[1.5*inch, 1.2*inch, 0.7*inch, 0.7*inch, 0.6*inch, 0.8*inch])
-    exam_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#366092')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 9),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 8),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.beige, colors.white]),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
-    elements.append(exam_table)
-    elements.append(Spacer(1, 20))
-    
-    # User Performance Section
-    elements.append(Paragraph("User Performance (Top 10)", section_style))
-    
-    user_data = [['Full Name', 'National ID', 'Assigned', 'Completed', 'Rate', 'Avg Score']]
-    for user in users:
-        completion_rate = (user.total_completed / user.total_assigned * 100) if user.total_assigned > 0 else 0
-        # Since score is not stored in ExamSession, we can't calculate average score
-        user_data.append([
-            user.name[:15] + '...' if len(user.name) > 15 else user.name,
-            user.national_id,
-            str(user.total_assigned or 0),
-            str(user.total_completed or 0),
-            f"{completion_rate:.1f}%",
-            "N/A"
-        ])
-    
-    user_table = Table(user_data, colWidths=[1.5*inch, 1.0*inch, 0.7*inch, 0.7*inch, 0.6*inch, 0.8*inch])
-    user_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#366092')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 9),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 8),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.beige, colors.white]),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
-    elements.append(user_table)
-    elements.append(Spacer(1, 20))
-    
-    # Recent Activity Section
-    elements.append(Paragraph("Recent Activity", section_style))
-    
-    activity_data = [['User', 'Exam', 'Score', 'Date', 'Duration']]
-    for session in recent_sessions:
-        # Calculate duration
-        if session.start_time and session.end_time:
-            duration = session.end_time - session.start_time
-            hours, remainder = divmod(duration.total_seconds(), 3600)
-            minutes, _ = divmod(remainder, 60)
-            duration_str = f"{int(hours)}h {int(minutes)}m"
-        else:
-            duration_str = "N/A"
-            
-        activity_data.append([
-            session.user_exam.user.name[:12] + '...' if len(session.user_exam.user.name) > 12 else session.user_exam.user.name,
-            session.user_exam.exam.exam_title[:15] + '...' if len(session.user_exam.exam.exam_title) > 15 else session.user_exam.exam.exam_title,
-            "N/A",  # Score is calculated but not stored in ExamSession
-            session.end_time.strftime('%m/%d %H:%M') if session.end_time else "N/A",
-            duration_str
-        ])
-    
-    activity_table = Table(activity_data, colWidths=[1.3*inch, 1.5*inch, 0.7*inch, 0.8*inch, 0.7*inch])
-    activity_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#366092')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 9),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 8),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.beige, colors.white]),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
-    elements.append(activity_table)
-    
-    # Build PDF
-    doc.build(elements)
-    
-    # Get the value of the BytesIO buffer and write it to the response
-    pdf = buffer.getvalue()
-    buffer.close()
-    
-    response = HttpResponse(content_type='application/pdf')
-    response['Content-Disposition'] = f'attachment; filename="reports_{timezone.now().strftime("%Y%m%d")}.pdf"'
-    response.write(pdf)
+    def rows():
+        yield ['Exam Name', 'Course', 'Total Assigned', 'Total Completed', 'Completion Rate']
+        for exam_title, course_name, total_assigned, total_completed in exams.iterator(chunk_size=2000):
+            completion_rate = (total_completed / total_assigned * 100) if total_assigned > 0 else 0
+            yield [exam_title, course_name, total_assigned, total_completed, f"{completion_rate:.1f}%"]
+    
+    writer = csv.writer(Echo())
+    response = StreamingHttpResponse((writer.writerow(row) for row in rows()), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="reports_{timezone.now().strftime("%Y%m%d")}.csv"'
     
     return response
 
 
+@login_required
+@user_passes_test(is_admin)
+def export_status_view(request, task_id):
+    """Report the state of a background export and its download URL once ready"""
+    result = AsyncResult(task_id)
+    if result.successful():
+        if not is_export_file(result.result):
+            return JsonResponse({'status': 'expired'}, status=410)
+        return JsonResponse({'status': 'ready', 'url': reverse('administration:export_download', args=[task_id])})
+    if result.failed():
+        return JsonResponse({'status': 'failed'}, status=500)
+    return JsonResponse({'status': 'pending'})
+
+
+@login_required
+@user_passes_test(is_admin)
+def export_download_view(request, task_id):
+    """Send a finished background export; the files are never linked directly"""
+    result = AsyncResult(task_id)
+    if not result.successful() or not is_export_file(result.result):
+        raise Http404
+    return FileResponse(
+        get_export_storage().open(result.result, 'rb'),
+        as_attachment=True,
+        filename=os.path.basename(result.result)
+    )
+
+
 @login_required
 @user_passes_test(is_admin)
 def question_edit_view(request, question_id):
     """Edit an existing question."""
-    question = get_object_or_404(Question, question_id=question_id)
-    
     if request.method == 'POST':
         exam_id = request.POST.get('exam')
-        question_type = request.POST.get('question_type')
-        question_text = request.POST.get('question_text')
-        option_a = request.POST.get('option_a', '')
-        option_b = request.POST.get('option_b', '')
-        option_c = request.POST.get('option_c', '')
-        option_d = request.POST.get('option_d', '')
-        correct_answer = request.POST.get('correct_answer')
         points = request.POST.get('points', 1.0)
         
         try:
-            exam = get_object_or_404(Exam, exam_id=exam_id)
+            if not Exam.objects.filter(exam_id=exam_id).exists():
+                raise Exam.DoesNotExist
             
-            # Update question fields
-            question.exam = exam
-            question.question_type = question_type
-            question.question_text = question_text
-            question.option_a = option_a
-            question.option_b = option_b
-            question.option_c = option_c
-            question.option_d = option_d
-            question.correct_answer = correct_answer
-            question.points = float(points) if points else 1.0
-            question.save()
+            # Write the new values in a single UPDATE without loading the row;
+            # the savepoint keeps a failed write from breaking an outer transaction
+            with transaction.atomic():
+                updated = Question.objects.filter(question_id=question_id).update(
+                    exam_id=exam_id,
+                    question_type=request.POST.get('question_type'),
+                    question_text=request.POST.get('question_text'),
+                    option_a=request.POST.get('option_a', ''),
+                    option_b=request.POST.get('option_b', ''),
+                    option_c=request.POST.get('option_c', ''),
+                    option_d=request.POST.get('option_d', ''),
+                    correct_answer=request.POST.get('correct_answer'),
+                    points=float(points) if points else 1.0,
+                )
+            
+        except Exam.DoesNotExist:
+            messages.error(request, 'Selected exam does not exist.')
+        
+        except (ValueError, ValidationError, IntegrityError) as e:
+            messages.error(request, f'Error updating question: {str(e)}')
+        
+        else:
+            if not updated:
+                raise Http404('No Question matches the given query.')
             
             messages.success(request, 'Question updated successfully!')
             return redirect('administration:question_list')
-            
-        except Exception as e:
-            messages.error(request, f'Error updating question: {str(e)}')
     
-    exams = Exam.objects.all().order_by('exam_title')
+    question = get_object_or_404(Question, question_id=question_id)
+    
+    exams = get_exam_choices()
     
     context = {
         'question': question,
@@ -1722,9 +1479,12 @@ def question_edit_view(request, question_id):
 @user_passes_test(is_admin)
 def question_preview_view(request, question_id):
     """Preview a question (AJAX endpoint)."""
-    question = get_object_or_404(Question, question_id=question_id)
+    question = get_object_or_404(
+        Question.objects.select_related('exam__course'), question_id=question_id
+    )
     
-    # Build options HTML for multiple choice
+    # Build options HTML for multiple choice; format_html escapes each value
+    # once and the list items are joined in a single pass
     options_html = ""
     if question.question_type == 'multiple_choice':
         options = [
@@ -1733,44 +1493,60 @@ def question_preview_view(request, question_id):
             ('C', question.option_c),
             ('D', question.option_d)
         ]
-        options_html = '<div class="options mb-3"><strong>Options:</strong><ul class="list-unstyled mt-2">'
-        for label, option_text in options:
-            if option_text:  # Only show non-empty options
-                is_correct = question.correct_answer == label
-                correct_class = ' class="text-success fw-bold"' if is_correct else ''
-                correct_icon = ' <i class="fas fa-check text-success"></i>' if is_correct else ''
-                options_html += f'<li{correct_class}><strong>{label}:</strong> {option_text}{correct_icon}</li>'
-        options_html += '</ul></div>'
+        options_html = format_html(
+            '<div class="options mb-3"><strong>Options:</strong><ul class="list-unstyled mt-2">{}</ul></div>',
+            format_html_join(
+                '',
+                '<li{}><strong>{}:</strong> {}{}</li>',
+                (
+                    (
+                        mark_safe(' class="text-success fw-bold"') if question.correct_answer == label else '',
+                        label,
+                        option_text,
+                        mark_safe(' <i class="fas fa-check text-success"></i>') if question.correct_answer == label else '',
+                    )
+                    for label, option_text in options
+                    if option_text  # Only show non-empty options
+                )
+            )
+        )
     
     # Build correct answer display
     if question.question_type == 'true_false':
-        correct_answer_display = f'<span class="badge bg-success">{"True" if question.correct_answer == "True" else "False"}</span>'
+        correct_answer_display = format_html('<span class="badge bg-success">{}</span>', "True" if question.correct_answer == "True" else "False")
     elif question.question_type == 'multiple_choice':
-        correct_answer_display = f'<span class="badge bg-success">Option {question.correct_answer}</span>'
+        correct_answer_display = format_html('<span class="badge bg-success">Option {}</span>', question.correct_answer)
     else:
-        correct_answer_display = f'<span class="badge bg-info">Text Answer</span>'
+        correct_answer_display = mark_safe('<span class="badge bg-info">Text Answer</span>')
     
-    html_content = f"""
+    html_content = format_html("""
     <div class="question-preview">
-        <h6>Question Type: {question.get_question_type_display()}</h6>
+        <h6>Question Type: {}</h6>
         <div class="question-text mb-3">
-            <strong>Question:</strong> {question.question_text}
+            <strong>Question:</strong> {}
         </div>
         
-        {options_html}
+        {}
         
         <div class="correct-answer mb-3">
             <strong>Correct Answer:</strong> 
-            {correct_answer_display}
+            {}
         </div>
         
         <div class="exam-info">
             <small class="text-muted">
-                <strong>Exam:</strong> {question.exam.exam_title} - {question.exam.course.course_name}
+                <strong>Exam:</strong> {} - {}
             </small>
         </div>
     </div>
-    """
+    """,
+        question.get_question_type_display(),
+        question.question_text,
+        options_html,
+        correct_answer_display,
+        question.exam.exam_title,
+        question.exam.course.course_name
+    )
     
     return JsonResponse({
         'success': True,
@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class AuthenticationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'authentication'
+
+    def ready(self):
+        from django.contrib.auth.signals import user_logged_in
+        from . import signals  # noqa: F401
+
+        # signals.update_last_login throttles the write django.contrib.auth
+        # would otherwise make on every login
+        user_logged_in.disconnect(dispatch_uid='update_last_login')
@@ -1,6 +1,5 @@
 from django.contrib.auth.backends import BaseBackend
 from django.contrib.auth import get_user_model
-from django.utils import timezone
 from django.conf import settings
 
 User = get_user_model()
@@ -12,32 +11,30 @@ class NationalIDBackend(BaseBackend):
     No password is required - only National ID validation.
     """
     
-    def authenticate(self, request, national_id=None, **kwargs):
+    def authenticate(self, request, national_id=None, user=None, **kwargs):
         if national_id is None:
             return None
         
-        try:
-            user = User.objects.get(national_id=national_id, is_active=True)
-            
-            # Check if user is locked due to too many failed attempts
-            if user.is_locked():
+        # Callers that already loaded the user (the login form) pass it in
+        if user is None or user.national_id != national_id:
+            user = User.objects.filter(national_id=national_id).first()
+            if user is None:
                 return None
-            
-            # Reset failed attempts on successful authentication
-            user.reset_failed_attempts()
-            user.last_login = timezone.now()
-            user.save(update_fields=['last_login'])
-            
-            return user
-            
-        except User.DoesNotExist:
+        
+        if not user.is_active:
             # Increment failed attempts for existing users if national_id exists
-            try:
-                user = User.objects.get(national_id=national_id)
-                user.increment_failed_attempts()
-            except User.DoesNotExist:
-                pass
+            user.increment_failed_attempts()
             return None
+        
+        # Check if user is locked due to too many failed attempts
+        if user.is_locked():
+            return None
+        
+        # Reset failed attempts on successful authentication; last_login is
+        # recorded by authentication.signals once login() runs
+        user.reset_failed_attempts()
+        
+        return user
     
     def get_user(self, user_id):
         try:
@@ -3,7 +3,8 @@ from django.shortcuts import redirect
 from django.contrib import messages
 from django.http import HttpResponseForbidden
 from django.core.exceptions import PermissionDenied
-from administration.models import Interface, UserInterfaceAccess
+from administration.models import Interface
+from administration.services import find_interface, get_user_interface_ids
 
 
 def require_interface_access(interface_name=None, module_name=None):
@@ -24,36 +25,25 @@ def require_interface_access(interface_name=None, module_name=None):
             if request.user.is_admin:
                 return view_func(request, *args, **kwargs)
             
-            try:
-                # Find the interface
-                if interface_name:
-                    interface = Interface.objects.get(function=interface_name)
-                elif module_name:
-                    interface = Interface.objects.get(module_name=module_name)
-                else:
-                    # Try to match by URL
-                    interface = Interface.objects.get(url=request.path_info)
-                
-                # Check user access
-                try:
-                    access = UserInterfaceAccess.objects.get(
-                        user=request.user,
-                        interface=interface
-                    )
-                    
-                    if not access.has_access:
-                        messages.error(request, f'You do not have access to {interface.module_name}.')
-                        return redirect('authentication:dashboard')
-                        
-                except UserInterfaceAccess.DoesNotExist:
-                    messages.error(request, f'You do not have access to {interface.module_name}.')
-                    return redirect('authentication:dashboard')
-                    
-            except Interface.DoesNotExist:
+            # Find the interface in the cached interface list
+            if interface_name:
+                interface = find_interface(function=interface_name)
+            elif module_name:
+                interface = find_interface(module_name=module_name)
+            else:
+                # Try to match by URL
+                interface = find_interface(url=request.path_info)
+            
+            if interface is None:
                 # Interface not found, deny access for security
                 messages.error(request, 'Access denied: Interface not found.')
                 return redirect('authentication:dashboard')
             
+            # No access record, or a revoked one, means no access
+            if interface['interface_id'] not in get_user_interface_ids(request.user):
+                messages.error(request, f'You do not have access to {interface["module_name"]}.')
+                return redirect('authentication:dashboard')
+            
             return view_func(request, *args, **kwargs)
         
         return wrapper
@@ -116,30 +106,20 @@ def check_interface_access(user, interface_name=None, module_name=None, url=None
     if user.is_admin:
         return True
     
-    try:
-        # Find the interface
-        if interface_name:
-            interface = Interface.objects.get(function=interface_name)
-        elif module_name:
-            interface = Interface.objects.get(module_name=module_name)
-        elif url:
-            interface = Interface.objects.get(url=url)
-        else:
-            return False
-        
-        # Check user access
-        try:
-            access = UserInterfaceAccess.objects.get(
-                user=user,
-                interface=interface
-            )
-            return access.has_access
-            
-        except UserInterfaceAccess.DoesNotExist:
-            return False
-            
-    except Interface.DoesNotExist:
+    # Find the interface in the cached interface list
+    if interface_name:
+        interface = find_interface(function=interface_name)
+    elif module_name:
+        interface = find_interface(module_name=module_name)
+    elif url:
+        interface = find_interface(url=url)
+    else:
         return False
+    
+    if interface is None:
+        return False
+    
+    return interface['interface_id'] in get_user_interface_ids(user)
 
 
 def get_user_interfaces(user):
@@ -155,14 +135,12 @@ def get_user_interfaces(user):
     if not user.is_authenticated:
         return Interface.objects.none()
     
+    # Only the columns menus and links need; display_name backs __str__
+    interfaces = Interface.objects.only('interface_id', 'module_name', 'function', 'url', 'display_name')
+    
     # Admin users have access to all interfaces
     if user.is_admin:
-        return Interface.objects.all()
+        return interfaces
     
     # Get interfaces where user has access
-    accessible_interfaces = UserInterfaceAccess.objects.filter(
-        user=user,
-        has_access=True
-    ).values_list('interface', flat=True)
-    
-    return Interface.objects.filter(interface_id__in=accessible_interfaces)
\ No newline at end of file
+    return interfaces.filter(interface_id__in=get_user_interface_ids(user))
\ No newline at end of file
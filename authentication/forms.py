@@ -1,6 +1,5 @@
 from django import forms
 from django.contrib.auth import authenticate
-from django.core.validators import RegexValidator
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -9,12 +8,6 @@ User = get_user_model()
 class NationalIDLoginForm(forms.Form):
     national_id = forms.CharField(
         max_length=14,
-        validators=[
-            RegexValidator(
-                regex=r'^[0-9]{14}$',
-                message='National ID must be exactly 14 digits.'
-            )
-        ],
         widget=forms.TextInput(attrs={
             'class': 'form-control',
             'placeholder': 'Enter your 14-digit National ID',
@@ -28,11 +21,16 @@ class NationalIDLoginForm(forms.Form):
     def __init__(self, request=None, *args, **kwargs):
         self.request = request
         self.user_cache = None
+        self._user_obj = None
         super().__init__(*args, **kwargs)
     
     def clean_national_id(self):
         national_id = self.cleaned_data.get('national_id')
         
+        # Same check as ^[0-9]{14}$; isascii() rules out non-ASCII digits
+        if national_id and not (len(national_id) == 14 and national_id.isascii() and national_id.isdigit()):
+            raise forms.ValidationError('National ID must be exactly 14 digits.')
+        
         if national_id:
             # Check if user exists and is active
             try:
@@ -46,6 +44,7 @@ class NationalIDLoginForm(forms.Form):
                         'This account has been locked due to too many failed login attempts. '
                         'Please contact an administrator.'
                     )
+                self._user_obj = user
             except User.DoesNotExist:
                 raise forms.ValidationError(
                     'Invalid National ID. Please check your ID and try again.'
@@ -57,17 +56,15 @@ class NationalIDLoginForm(forms.Form):
         national_id = self.cleaned_data.get('national_id')
         
         if national_id:
+            # Hand the user loaded by clean_national_id to the backend
             self.user_cache = authenticate(
                 self.request,
-                national_id=national_id
+                national_id=national_id,
+                user=self._user_obj
             )
             if self.user_cache is None:
-                # Try to get the user to increment failed attempts
-                try:
-                    user = User.objects.get(national_id=national_id)
-                    user.increment_failed_attempts()
-                except User.DoesNotExist:
-                    pass
+                if self._user_obj is not None:
+                    self._user_obj.increment_failed_attempts()
                 
                 raise forms.ValidationError(
                     'Authentication failed. Please check your National ID.'
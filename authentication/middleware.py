@@ -1,8 +1,33 @@
+from django.conf import settings
 from django.shortcuts import redirect
 from django.contrib import messages
-from django.urls import resolve
+from django.contrib.auth import SESSION_KEY
+from django.urls import get_script_prefix, resolve
 from django.http import HttpResponseForbidden
-from administration.models import Interface, UserInterfaceAccess
+import time
+from functools import lru_cache
+from administration.services import get_interface_for_url, get_user_interface_ids
+
+
+def _unchecked_path_prefixes():
+    """Static and media URL paths, plus the favicon, as a tuple for str.startswith."""
+    # A URL on another host (a CDN) never reaches Django, and an unset
+    # MEDIA_URL reads back as the bare script prefix, which would match every
+    # path, so both are left out
+    asset_urls = (settings.STATIC_URL, settings.MEDIA_URL)
+    script_prefix = get_script_prefix()
+    return (*(url for url in asset_urls if url and url.startswith('/') and url != script_prefix), '/favicon')
+
+
+# Asset paths never hit an access-controlled view or need the session
+UNCHECKED_PATH_PREFIXES = _unchecked_path_prefixes()
+
+
+@lru_cache(maxsize=1024)
+def resolve_url_name(path):
+    """Return the namespaced URL name for path; the URLconf is fixed per process."""
+    resolved = resolve(path)
+    return f"{resolved.namespace}:{resolved.url_name}" if resolved.namespace else resolved.url_name
 
 
 class InterfaceAccessMiddleware:
@@ -18,6 +43,7 @@ class InterfaceAccessMiddleware:
             'authentication:login',
             'authentication:logout',
             'authentication:dashboard',
+            'authentication:check_session',  # Session poll, checks the user itself
             'admin:index',  # Django admin
         ]
         
@@ -25,11 +51,17 @@ class InterfaceAccessMiddleware:
         self.admin_only_urls = [
             'administration:',  # All administration URLs
         ]
+        
+        # Exact names are matched by set membership, admin URLs by namespace prefix
+        self._exempt_set = frozenset(self.exempt_urls)
+        self._admin_prefixes = tuple(self.admin_only_urls)
     
     def __call__(self, request):
+        if request.path.startswith(UNCHECKED_PATH_PREFIXES):
+            return self.get_response(request)
+        
         # Process the request before the view
-        if request.user.is_authenticated:
-            self.check_interface_access(request)
+        self.check_interface_access(request)
         
         response = self.get_response(request)
         return response
@@ -40,44 +72,35 @@ class InterfaceAccessMiddleware:
         """
         try:
             # Get the current URL name
-            resolved = resolve(request.path_info)
-            url_name = f"{resolved.namespace}:{resolved.url_name}" if resolved.namespace else resolved.url_name
+            url_name = resolve_url_name(request.path_info)
             
             # Skip access control for exempt URLs
-            if any(exempt in url_name for exempt in self.exempt_urls):
+            if url_name in self._exempt_set:
+                return
+            
+            # Exempt URLs are decided before the user is loaded
+            if not request.user.is_authenticated:
                 return
             
             # Check if user is admin for admin-only URLs
-            if any(admin_url in url_name for admin_url in self.admin_only_urls):
+            if url_name.startswith(self._admin_prefixes):
                 if not request.user.is_admin:
                     messages.error(request, 'You do not have permission to access this area.')
                     return redirect('authentication:dashboard')
                 return
             
-            # Check interface-specific access
-            try:
-                interface = Interface.objects.get(url=request.path_info)
-                
-                # Check if user has access to this interface
-                try:
-                    access = UserInterfaceAccess.objects.get(
-                        user=request.user,
-                        interface=interface
-                    )
-                    
-                    if not access.has_access:
-                        messages.error(request, f'You do not have access to {interface.module_name}.')
-                        return redirect('authentication:dashboard')
-                        
-                except UserInterfaceAccess.DoesNotExist:
-                    # No access record means no access
-                    messages.error(request, f'You do not have access to {interface.module_name}.')
-                    return redirect('authentication:dashboard')
-                    
-            except Interface.DoesNotExist:
+            # Check interface-specific access against the cached interface
+            # map and the user's cached grants instead of two lookups per hit
+            interface = get_interface_for_url(request.path_info)
+            if interface is None:
                 # Interface not defined, allow access for now
                 # This allows for gradual implementation of interface control
-                pass
+                return
+            
+            # No access record, or a revoked one, means no access
+            if interface['interface_id'] not in get_user_interface_ids(request.user):
+                messages.error(request, f'You do not have access to {interface["module_name"]}.')
+                return redirect('authentication:dashboard')
                 
         except Exception as e:
             # Log the error in production
@@ -94,9 +117,17 @@ class SessionTimeoutMiddleware:
         self.get_response = get_response
         # Session timeout in seconds (30 minutes)
         self.session_timeout = 30 * 60
+        # Only rewrite last_activity once it is this stale, so a burst of
+        # requests does not save the session on every hit
+        self.activity_resolution = 60
     
     def __call__(self, request):
-        if request.user.is_authenticated:
+        if request.path.startswith(UNCHECKED_PATH_PREFIXES):
+            return self.get_response(request)
+        
+        # The session's auth key says whether anyone is logged in without
+        # loading the user row
+        if SESSION_KEY in request.session:
             self.check_session_timeout(request)
         
         response = self.get_response(request)
@@ -106,22 +137,22 @@ class SessionTimeoutMiddleware:
         """
         Check if the session has timed out
         """
-        from django.utils import timezone
         from django.contrib.auth import logout
         
+        now = int(time.time())
         last_activity = request.session.get('last_activity')
         
-        if last_activity:
-            # Convert string back to datetime if needed
-            if isinstance(last_activity, str):
-                from datetime import datetime
-                last_activity = datetime.fromisoformat(last_activity)
-            
+        # Sessions written before timestamps were stored as integers carry an
+        # ISO string; treat them as fresh rather than parsing the string
+        if isinstance(last_activity, int):
             # Check if session has expired
-            if (timezone.now() - last_activity).total_seconds() > self.session_timeout:
+            if now - last_activity > self.session_timeout:
                 logout(request)
                 messages.warning(request, 'Your session has expired. Please log in again.')
                 return redirect('authentication:login')
         
+            if now - last_activity < self.activity_resolution:
+                return
+        
         # Update last activity
-        request.session['last_activity'] = timezone.now().isoformat()
\ No newline at end of file
+        request.session['last_activity'] = now
@@ -1,9 +1,14 @@
+from django.conf import settings
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 from django.db import models
+from django.db.models import F
 from django.utils import timezone
 from django.core.validators import RegexValidator
 
 
+MAX_LOGIN_ATTEMPTS = getattr(settings, 'MAX_LOGIN_ATTEMPTS', 5)
+
+
 class UserManager(BaseUserManager):
     def create_user(self, national_id, name, **extra_fields):
         if not national_id:
@@ -33,6 +38,13 @@ class UserManager(BaseUserManager):
 
         return self.create_user(national_id, name, **extra_fields)
 
+    def increment_failed_attempts(self, **lookup):
+        """Bump the failed login counter in the database without loading the user."""
+        return self.filter(**lookup).update(
+            failed_login_attempts=F('failed_login_attempts') + 1,
+            last_login_attempt=timezone.now(),
+        )
+
 
 class User(AbstractBaseUser, PermissionsMixin):
     national_id_validator = RegexValidator(
@@ -74,6 +86,10 @@ class User(AbstractBaseUser, PermissionsMixin):
         db_table = 'users'
         verbose_name = 'User'
         verbose_name_plural = 'Users'
+        indexes = [
+            models.Index(fields=['-date_joined'], name='users_joined_idx'),
+            models.Index(fields=['is_active', 'is_admin'], name='users_active_admin_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.national_id})"
@@ -85,14 +101,13 @@ class User(AbstractBaseUser, PermissionsMixin):
         return self.name
     
     def reset_failed_attempts(self):
-        self.failed_login_attempts = 0
-        self.save(update_fields=['failed_login_attempts'])
+        if self.failed_login_attempts:
+            self.failed_login_attempts = 0
+            self.save(update_fields=['failed_login_attempts'])
     
     def increment_failed_attempts(self):
+        User.objects.increment_failed_attempts(pk=self.pk)
         self.failed_login_attempts += 1
-        self.last_login_attempt = timezone.now()
-        self.save(update_fields=['failed_login_attempts', 'last_login_attempt'])
     
     def is_locked(self):
-        from django.conf import settings
-        return self.failed_login_attempts >= getattr(settings, 'MAX_LOGIN_ATTEMPTS', 5)
+        return self.failed_login_attempts >= MAX_LOGIN_ATTEMPTS
@@ -0,0 +1,21 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.signals import user_logged_in
+from django.dispatch import receiver
+from django.utils import timezone
+
+
+LAST_LOGIN_UPDATE_INTERVAL = timedelta(seconds=60)
+
+
+@receiver(user_logged_in, dispatch_uid='throttled_update_last_login')
+def update_last_login(sender, user, **kwargs):
+    """
+    Record the login at most once a minute, with a narrow UPDATE. Replaces
+    django.contrib.auth's handler, which saves last_login on every login.
+    """
+    now = timezone.now()
+    if user.last_login is None or now - user.last_login > LAST_LOGIN_UPDATE_INTERVAL:
+        get_user_model().objects.filter(pk=user.pk).update(last_login=now)
+        user.last_login = now
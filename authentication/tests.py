@@ -1,3 +1,108 @@
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 
-# Create your tests here.
+from .models import User
+from .views import LOGIN_RATE_LIMIT
+
+
+class LoginRateLimitTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('authentication:login')
+
+    def post(self, national_id, address='10.0.0.1'):
+        return self.client.post(self.url, {'national_id': national_id}, REMOTE_ADDR=address)
+
+    def exhaust(self, national_id, address='10.0.0.1'):
+        for _ in range(LOGIN_RATE_LIMIT):
+            self.assertEqual(self.post(national_id, address).status_code, 200)
+
+    def test_throttled_attempt_skips_the_database(self):
+        self.exhaust('29901011234567')
+        with self.assertNumQueries(0):
+            response = self.post('29901011234567')
+        self.assertEqual(response.status_code, 429)
+
+    def test_buckets_are_per_address_and_id_prefix(self):
+        self.exhaust('29901011234567')
+        # Same birth-date prefix from the same address shares the bucket
+        self.assertEqual(self.post('29901019999999').status_code, 429)
+        self.assertEqual(self.post('30001011234567').status_code, 200)
+        self.assertEqual(self.post('29901011234567', address='10.0.0.2').status_code, 200)
+
+
+class CheckSessionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('10000000000001', 'Student')
+        self.url = reverse('authentication:check_session')
+
+    def login(self):
+        response = self.client.post(reverse('authentication:login'), {'national_id': self.user.national_id})
+        self.assertEqual(response.status_code, 302)
+
+    def expire_user_check(self):
+        session = self.client.session
+        session['user_checked_at'] = 0
+        session.save()
+
+    def poll(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_anonymous(self):
+        self.assertEqual(self.poll(), {'authenticated': False})
+
+    def test_recent_check_is_answered_from_the_session(self):
+        self.login()
+        with CaptureQueriesContext(connection) as queries:
+            data = self.poll()
+        self.assertEqual(data, {'authenticated': True, 'user_id': self.user.pk, 'name': 'Student'})
+        self.assertFalse(any('"users"' in query['sql'] for query in queries.captured_queries))
+
+    def test_session_without_stored_name_checks_the_user(self):
+        self.client.force_login(self.user)
+        self.assertEqual(self.poll()['name'], 'Student')
+
+    def test_changed_auth_hash_is_logged_out(self):
+        self.client.force_login(self.user)
+        self.user.set_password('changed')
+        self.user.save()
+        self.assertEqual(self.poll(), {'authenticated': False})
+
+    def test_deleted_user_is_logged_out(self):
+        self.login()
+        self.user.delete()
+        self.expire_user_check()
+        self.assertEqual(self.poll(), {'authenticated': False})
+
+    def test_deactivated_user_is_logged_out(self):
+        self.login()
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.expire_user_check()
+        self.assertEqual(self.poll(), {'authenticated': False})
+
+
+class LastLoginTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('10000000000001', 'Student')
+
+    def login_writes(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(reverse('authentication:login'), {'national_id': self.user.national_id})
+        self.client.logout()
+        return [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith('UPDATE "users"') and '"last_login"' in query['sql']
+        ]
+
+    def test_last_login_is_written_at_most_once_a_minute(self):
+        self.assertEqual(len(self.login_writes()), 1)
+        self.user.refresh_from_db()
+        self.assertIsNotNone(self.user.last_login)
+        self.assertEqual(self.login_writes(), [])
@@ -1,17 +1,44 @@
 from django.shortcuts import render, redirect
-from django.contrib.auth import authenticate, login, logout
+from django.contrib.auth import SESSION_KEY, authenticate, login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.conf import settings
+from django.core.cache import cache
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt, csrf_protect
 from django.views.decorators.cache import never_cache
 from django.views.decorators.http import require_http_methods
 from django.db.models import Avg, Count, Q
+from django.utils import timezone
+import time
 from .forms import NationalIDLoginForm
 from .models import User
 from exams.models import UserExam
 
 
+LOGIN_RATE_LIMIT = getattr(settings, 'LOGIN_RATE_LIMIT', 10)
+LOGIN_RATE_WINDOW = 60
+# How long check_session trusts the session before loading the user again
+SESSION_USER_RECHECK_INTERVAL = 60
+
+
+def _login_rate_limited(request):
+    """Count a login attempt in the cache and report whether the bucket is over the limit."""
+    # Bucketed per client address and National ID prefix (century and birth
+    # date), so one shared NAT address does not lock out a whole classroom.
+    # REMOTE_ADDR is used as-is; a proxy must set it from X-Forwarded-For.
+    national_id = request.POST.get('national_id', '')[:7]
+    key = f"login_attempts:{request.META.get('REMOTE_ADDR', '')}:{national_id}"
+    cache.add(key, 0, LOGIN_RATE_WINDOW)
+    try:
+        attempts = cache.incr(key)
+    except ValueError:
+        # The bucket expired between add() and incr()
+        cache.set(key, 1, LOGIN_RATE_WINDOW)
+        attempts = 1
+    return attempts > LOGIN_RATE_LIMIT
+
+
 @csrf_protect
 @never_cache
 def login_view(request):
@@ -20,10 +47,17 @@ def login_view(request):
         return redirect('authentication:dashboard')
     
     if request.method == 'POST':
+        # Throttled attempts are turned away before the form touches the database
+        if _login_rate_limited(request):
+            messages.error(request, 'Too many login attempts. Please wait a minute and try again.')
+            return render(request, 'authentication/login.html', {'form': NationalIDLoginForm()}, status=429)
         form = NationalIDLoginForm(request, data=request.POST)
         if form.is_valid():
             user = form.get_user()
             login(request, user)
+            # check_session reports the name from here instead of loading the user
+            request.session['user_name'] = user.name
+            request.session['user_checked_at'] = int(time.time())
             messages.success(request, f'Welcome, {user.name}!')
             
             # Redirect to next page or dashboard
@@ -58,17 +92,29 @@ def dashboard_view(request):
         }
         return render(request, 'authentication/dashboard.html', context)
     
-    user_exams = UserExam.objects.filter(user=request.user).select_related('exam', 'exam__course').prefetch_related('exam_sessions')
-    
-    # Categorize exams by status based on exam sessions
-    assigned_exams = user_exams
+    # Only the fields the cards show are selected, as dicts; attempt and
+    # question counts are annotated and status is a column, so rendering
+    # needs no further queries
+    assigned_exams = list(
+        UserExam.objects.filter(user=request.user).with_attempts().with_question_count().values(
+            'user_exam_id', 'completion_state', 'due_date', 'attempts_allowed',
+            'attempt_count', 'question_count', 'exam__exam_title', 'exam__description',
+            'exam__time_limit', 'exam__start_time', 'exam__end_time', 'exam__course__course_name',
+        )
+    )
     completed_exams = []
     pending_exams = []
     
-    for user_exam in user_exams:
-        # Check if user has any submitted sessions for this exam
-        submitted_sessions = user_exam.exam_sessions.filter(is_submitted=True)
-        if submitted_sessions.exists():
+    # Same rules as Exam.is_available and UserExam.can_take_exam
+    now = timezone.now()
+    for user_exam in assigned_exams:
+        start_time, end_time = user_exam['exam__start_time'], user_exam['exam__end_time']
+        user_exam['is_available'] = not (start_time and now < start_time) and not (end_time and now > end_time)
+        user_exam['can_take_exam'] = (
+            user_exam['attempt_count'] < user_exam['attempts_allowed'] and
+            now <= user_exam['due_date']
+        )
+        if user_exam['completion_state'] == 'completed':
             completed_exams.append(user_exam)
         else:
             pending_exams.append(user_exam)
@@ -85,11 +131,13 @@ def dashboard_view(request):
 @login_required
 def profile_view(request):
     """Display user profile information"""
-    user_exams = UserExam.objects.filter(user=request.user)
-    
-    # Calculate statistics
-    total_assigned = user_exams.count()
-    total_completed = user_exams.filter(exam_sessions__is_submitted=True).distinct().count()
+    # Calculate statistics in one aggregate query
+    stats = UserExam.objects.filter(user=request.user).aggregate(
+        total_assigned=Count('pk'),
+        total_completed=Count('pk', filter=Q(completion_state='completed')),
+    )
+    total_assigned = stats['total_assigned']
+    total_completed = stats['total_completed']
     total_pending = total_assigned - total_completed
     
     # Calculate average score for completed exams
@@ -109,11 +157,28 @@ def profile_view(request):
 
 def check_session(request):
     """AJAX endpoint to check if user session is still valid"""
-    if request.user.is_authenticated:
+    if SESSION_KEY not in request.session:
+        return JsonResponse({'authenticated': False})
+    
+    # Answer from the session between user checks so polling does not load
+    # the user row every time
+    checked_at = request.session.get('user_checked_at')
+    if isinstance(checked_at, int) and time.time() - checked_at < SESSION_USER_RECHECK_INTERVAL:
         return JsonResponse({
             'authenticated': True,
-            'user_id': request.user.id,
-            'name': request.user.name
+            'user_id': User._meta.pk.to_python(request.session[SESSION_KEY]),
+            'name': request.session['user_name']
         })
-    else:
+    
+    # Loading the user validates the session auth hash and that the user
+    # still exists; deactivated users are reported as logged out too
+    user = request.user
+    if not user.is_authenticated or not user.is_active:
         return JsonResponse({'authenticated': False})
+    request.session['user_name'] = user.name
+    request.session['user_checked_at'] = int(time.time())
+    return JsonResponse({
+        'authenticated': True,
+        'user_id': user.pk,
+        'name': user.name
+    })
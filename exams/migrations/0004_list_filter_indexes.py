@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-15 03:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0003_question_points'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['-created_at'], name='courses_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='exam',
+            index=models.Index(fields=['-created_at'], name='exams_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='exam',
+            index=models.Index(fields=['course', '-created_at'], name='exams_course_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['exam', 'question_type'], name='questions_exam_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userexam',
+            index=models.Index(fields=['-assigned_date'], name='userexams_assigned_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-15 03:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0004_list_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['course_name'], name='courses_name_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-15 04:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0005_course_name_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='examsession',
+            index=models.Index(fields=['user_exam', 'is_submitted'], name='examsessions_submitted_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.7 on 2026-10-15 04:07
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Concat
+
+
+def backfill_search_blob(apps, schema_editor):
+    Course = apps.get_model('exams', 'Course')
+    Exam = apps.get_model('exams', 'Exam')
+    course_name = Subquery(Course.objects.filter(pk=OuterRef('course_id')).values('course_name')[:1])
+    Exam.objects.update(
+        search_blob=Concat('exam_title', Value(' '), course_name, output_field=models.CharField())
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0006_examsession_submitted_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exam',
+            name='search_blob',
+            field=models.CharField(default='', editable=False, max_length=511),
+        ),
+        migrations.RunPython(backfill_search_blob, migrations.RunPython.noop),
+    ]
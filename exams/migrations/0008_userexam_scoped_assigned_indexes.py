@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-15 04:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0007_exam_search_blob'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userexam',
+            index=models.Index(fields=['exam', '-assigned_date'], name='userexams_exam_assigned_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userexam',
+            index=models.Index(fields=['user', '-assigned_date'], name='userexams_user_assigned_idx'),
+        ),
+    ]
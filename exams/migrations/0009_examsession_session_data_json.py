@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-15 04:31
+
+import json
+
+from django.db import migrations, models
+
+
+def reset_invalid_session_data(apps, schema_editor):
+    # get_session_data() used to treat blank or malformed text as {}; make
+    # those rows valid JSON so the column can be converted
+    ExamSession = apps.get_model('exams', 'ExamSession')
+    invalid = []
+    for pk, data in ExamSession.objects.values_list('pk', 'session_data').iterator():
+        try:
+            json.loads(data)
+        except (TypeError, ValueError):
+            invalid.append(pk)
+    ExamSession.objects.filter(pk__in=invalid).update(session_data='{}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0008_userexam_scoped_assigned_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(reset_invalid_session_data, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='examsession',
+            name='session_data',
+            field=models.JSONField(default=dict, help_text='JSON data storing current answers'),
+        ),
+    ]
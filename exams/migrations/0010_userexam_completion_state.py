@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-15 04:33
+
+from django.db import migrations, models
+from django.db.models import Case, Exists, OuterRef, Value, When
+
+
+def backfill_completion_state(apps, schema_editor):
+    ExamSession = apps.get_model('exams', 'ExamSession')
+    UserExam = apps.get_model('exams', 'UserExam')
+    sessions = ExamSession.objects.filter(user_exam=OuterRef('pk'))
+    UserExam.objects.update(
+        completion_state=Case(
+            When(Exists(sessions.filter(is_submitted=True)), then=Value('completed')),
+            When(Exists(sessions), then=Value('in_progress')),
+            default=Value('not_started'),
+            output_field=models.CharField()
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0009_examsession_session_data_json'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userexam',
+            name='completion_state',
+            field=models.CharField(choices=[('not_started', 'Not Started'), ('in_progress', 'In Progress'), ('completed', 'Completed')], db_index=True, default='not_started', editable=False, max_length=20),
+        ),
+        migrations.RunPython(backfill_completion_state, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.7 on 2026-10-15 04:36
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_time_limit_seconds(apps, schema_editor):
+    Exam = apps.get_model('exams', 'Exam')
+    ExamSession = apps.get_model('exams', 'ExamSession')
+    time_limit = Subquery(Exam.objects.filter(pk=OuterRef('exam_id')).values('time_limit')[:1])
+    ExamSession.objects.update(time_limit_seconds=time_limit * 60)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0010_userexam_completion_state'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='examsession',
+            name='time_limit_seconds',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_time_limit_seconds, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-15 04:37
+
+from django.db import migrations, models
+import exams.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0011_examsession_time_limit_seconds'),
+    ]
+
+    # The default is applied in Python only, so skip the table rebuild some
+    # backends would otherwise do for an altered primary key
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='examsession',
+                    name='session_id',
+                    field=models.UUIDField(default=exams.models.uuid7, editable=False, primary_key=True, serialize=False),
+                ),
+            ],
+        ),
+    ]
@@ -1,11 +1,30 @@
 from django.db import models
+from django.db.models import F, Func, OuterRef, Subquery, Value
+from django.db.models.functions import Concat
 from django.utils import timezone
 from django.conf import settings
 from django.core.validators import MinValueValidator, MaxValueValidator
-import json
+import os
+import time
 import uuid
 
 
+def uuid7():
+    """
+    Return a time-ordered UUID (RFC 9562 version 7): a 48-bit millisecond
+    timestamp followed by random bits, so new keys sort after existing ones.
+    """
+    timestamp_ms = (time.time_ns() // 1_000_000) & ((1 << 48) - 1)
+    value = (timestamp_ms << 80) | int.from_bytes(os.urandom(10), 'big')
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC 4122 variant
+    return uuid.UUID(int=value)
+
+
+# Shared by every true/false question, so get_options need not rebuild it
+TRUE_FALSE_OPTIONS = (('True', 'True'), ('False', 'False'))
+
+
 class Course(models.Model):
     course_id = models.AutoField(primary_key=True)
     course_name = models.CharField(max_length=255)
@@ -17,9 +36,23 @@ class Course(models.Model):
         db_table = 'courses'
         verbose_name = 'Course'
         verbose_name_plural = 'Courses'
+        indexes = [
+            models.Index(fields=['-created_at'], name='courses_created_idx'),
+            models.Index(fields=['course_name'], name='courses_name_idx'),
+        ]
     
     def __str__(self):
         return self.course_name
+    
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        if not adding and (update_fields is None or 'course_name' in update_fields):
+            # Keep the denormalized exam search text in step with a rename
+            self.exams.update(
+                search_blob=Concat('exam_title', Value(' '), Value(self.course_name), output_field=models.CharField())
+            )
 
 
 class Exam(models.Model):
@@ -35,16 +68,31 @@ class Exam(models.Model):
     end_time = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
+    # "<exam_title> <course_name>", so admin search does not join courses
+    search_blob = models.CharField(max_length=511, default='', editable=False)
     
     class Meta:
         db_table = 'exams'
         verbose_name = 'Exam'
         verbose_name_plural = 'Exams'
+        indexes = [
+            models.Index(fields=['-created_at'], name='exams_created_idx'),
+            models.Index(fields=['course', '-created_at'], name='exams_course_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.exam_title} ({self.course.course_name})"
     
+    def save(self, *args, **kwargs):
+        self.search_blob = f"{self.exam_title} {self.course.course_name}"
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'exam_title', 'course'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'search_blob'}
+        super().save(*args, **kwargs)
+    
     def get_total_questions(self):
+        if hasattr(self, 'question_count'):
+            return self.question_count
         return self.questions.count()
     
     def is_available(self):
@@ -82,44 +130,89 @@ class Question(models.Model):
         verbose_name = 'Question'
         verbose_name_plural = 'Questions'
         ordering = ['sort_order', 'question_id']
+        indexes = [
+            models.Index(fields=['exam', 'question_type'], name='questions_exam_type_idx'),
+        ]
     
     def __str__(self):
         return f"Q{self.sort_order}: {self.question_text[:50]}..."
     
     def get_options(self):
+        """Return the answer choices as ordered (value, text) pairs."""
         if self.question_type == 'multiple_choice':
-            return {
-                'A': self.option_a,
-                'B': self.option_b,
-                'C': self.option_c,
-                'D': self.option_d,
-            }
+            return (
+                ('A', self.option_a),
+                ('B', self.option_b),
+                ('C', self.option_c),
+                ('D', self.option_d),
+            )
         elif self.question_type == 'true_false':
-            return {
-                'True': 'True',
-                'False': 'False',
-            }
-        return {}
+            return TRUE_FALSE_OPTIONS
+        return ()
+
+
+class UserExamQuerySet(models.QuerySet):
+    def with_attempts(self):
+        """Annotate attempt_count, the number of submitted sessions per assignment."""
+        # A correlated COUNT keeps the outer query free of a session join and
+        # of a GROUP BY over every selected (and select_related) column
+        attempt_count = ExamSession.objects.filter(
+            user_exam=OuterRef('pk'), is_submitted=True
+        ).order_by().annotate(
+            n=Func(F('pk'), function='COUNT')
+        ).values('n')
+        return self.annotate(
+            attempt_count=Subquery(attempt_count, output_field=models.IntegerField())
+        )
+    
+    def with_question_count(self):
+        """Annotate question_count, the number of questions in each assignment's exam."""
+        question_count = Question.objects.filter(exam=OuterRef('exam')).order_by().annotate(
+            n=Func(F('pk'), function='COUNT')
+        ).values('n')
+        return self.annotate(
+            question_count=Subquery(question_count, output_field=models.IntegerField())
+        )
 
 
 class UserExam(models.Model):
+    COMPLETION_STATES = [
+        ('not_started', 'Not Started'),
+        ('in_progress', 'In Progress'),
+        ('completed', 'Completed'),
+    ]
+    
     user_exam_id = models.AutoField(primary_key=True)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='assigned_exams')
     exam = models.ForeignKey(Exam, on_delete=models.CASCADE, related_name='user_assignments')
     assigned_date = models.DateTimeField(default=timezone.now)
     due_date = models.DateTimeField()
     attempts_allowed = models.IntegerField(default=1, validators=[MinValueValidator(1)])
+    # Denormalized from the assignment's sessions, kept in sync by administration.signals
+    completion_state = models.CharField(
+        max_length=20, choices=COMPLETION_STATES, default='not_started', db_index=True, editable=False
+    )
+    
+    objects = UserExamQuerySet.as_manager()
     
     class Meta:
         db_table = 'userexams'
         verbose_name = 'User Exam Assignment'
         verbose_name_plural = 'User Exam Assignments'
         unique_together = ['user', 'exam']
+        indexes = [
+            models.Index(fields=['-assigned_date'], name='userexams_assigned_idx'),
+            # Per-exam results and per-user history list assignments newest first
+            models.Index(fields=['exam', '-assigned_date'], name='userexams_exam_assigned_idx'),
+            models.Index(fields=['user', '-assigned_date'], name='userexams_user_assigned_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.name} - {self.exam.exam_title}"
     
     def get_attempts_taken(self):
+        if hasattr(self, 'attempt_count'):
+            return self.attempt_count
         return self.exam_sessions.filter(is_submitted=True).count()
     
     def can_take_exam(self):
@@ -130,76 +223,80 @@ class UserExam(models.Model):
     
     @property
     def status(self):
-        """Calculate status based on exam sessions and conditions"""
-        # Check if any attempts have been completed
-        if self.exam_sessions.filter(is_submitted=True).exists():
-            return 'completed'
-        
-        # Check if there's an active session
-        active_session = self.exam_sessions.filter(is_submitted=False).first()
-        if active_session:
-            return 'in_progress'
-        
-        # Default to not started
-        return 'not_started'
+        """Completion status, read from the denormalized completion_state column"""
+        return self.completion_state
+    
+    def refresh_completion_state(self):
+        """Recompute completion_state from the sessions and store it if it changed."""
+        # Any submitted attempt means completed, any other session in progress
+        flags = set(self.exam_sessions.order_by().values_list('is_submitted', flat=True).distinct())
+        if True in flags:
+            state = 'completed'
+        elif flags:
+            state = 'in_progress'
+        else:
+            state = 'not_started'
+        if state != self.completion_state:
+            UserExam.objects.filter(pk=self.pk).update(completion_state=state)
+            self.completion_state = state
+        return state
 
 
 class ExamSession(models.Model):
-    session_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    session_id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     user_exam = models.ForeignKey(UserExam, on_delete=models.CASCADE, related_name='exam_sessions')
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     exam = models.ForeignKey(Exam, on_delete=models.CASCADE)
     start_time = models.DateTimeField(default=timezone.now)
     end_time = models.DateTimeField(null=True, blank=True)
-    session_data = models.TextField(default='{}', help_text='JSON data storing current answers')
+    session_data = models.JSONField(default=dict, help_text='JSON data storing current answers')
     is_submitted = models.BooleanField(default=False)
+    # Exam time limit in seconds, copied when the session starts (see save())
+    time_limit_seconds = models.PositiveIntegerField(default=0, editable=False)
     
     class Meta:
         db_table = 'examsessions'
         verbose_name = 'Exam Session'
         verbose_name_plural = 'Exam Sessions'
+        indexes = [
+            models.Index(fields=['user_exam', 'is_submitted'], name='examsessions_submitted_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.name} - {self.exam.exam_title} - {self.start_time}"
     
+    def save(self, *args, **kwargs):
+        if self._state.adding and not self.time_limit_seconds:
+            # Snapshot the limit so the timing checks below never follow the exam FK
+            self.time_limit_seconds = self.exam.time_limit * 60
+        super().save(*args, **kwargs)
+    
+    def _seconds_left(self):
+        """Seconds until the time limit runs out, negative once it has."""
+        return self.time_limit_seconds - (timezone.now() - self.start_time).total_seconds()
+    
     def is_time_expired(self):
         """Check if exam session time has expired"""
-        from django.utils import timezone
         if not self.start_time:
             return False
-        
-        elapsed_time = timezone.now() - self.start_time
-        exam_duration_seconds = self.user_exam.exam.time_limit * 60  # Convert minutes to seconds
-        return elapsed_time.total_seconds() > exam_duration_seconds
+        return self._seconds_left() < 0
     
     def get_time_remaining(self):
         """Get remaining time in seconds"""
-        from django.utils import timezone
         if not self.start_time:
             return 0
-        
-        elapsed_time = timezone.now() - self.start_time
-        exam_duration_seconds = self.user_exam.exam.time_limit * 60
-        remaining_seconds = exam_duration_seconds - elapsed_time.total_seconds()
-        return max(0, int(remaining_seconds))
+        return max(0, int(self._seconds_left()))
     
     def get_session_data(self):
-        try:
-            return json.loads(self.session_data) if self.session_data else {}
-        except json.JSONDecodeError:
-            return {}
+        return self.session_data or {}
     
     def set_session_data(self, data):
-        self.session_data = json.dumps(data)
+        self.session_data = data
     
     def get_remaining_time_seconds(self):
         if self.is_submitted or self.end_time:
             return 0
-        
-        elapsed = timezone.now() - self.start_time
-        total_seconds = self.exam.time_limit * 60
-        remaining = total_seconds - elapsed.total_seconds()
-        return max(0, int(remaining))
+        return self.get_time_remaining()
     
     def is_expired(self):
         return self.get_time_remaining() <= 0
@@ -10,7 +10,7 @@ def get_item(dictionary, key):
         return dictionary.get(key)
     return None
 
-@register.filter
+@register.filter(is_safe=True)
 def score_percentage(score):
     """Format score as percentage for CSS width."""
     try:
@@ -18,25 +18,22 @@ def score_percentage(score):
     except (ValueError, TypeError):
         return "0"
 
-@register.filter
+@register.filter(is_safe=True)
 def time_format(seconds):
     """Format seconds into MM:SS format."""
     try:
-        minutes = int(seconds) // 60
-        seconds = int(seconds) % 60
-        return f"{minutes}:{seconds:02d}"
+        minutes, seconds = divmod(int(seconds), 60)
     except (ValueError, TypeError):
         return "0:00"
+    return f"{minutes}:{seconds:02d}"
 
-@register.filter
+@register.filter(is_safe=True)
 def duration_format(start_time, end_time):
     """Calculate and format duration between two datetime objects."""
     if start_time and end_time:
-        duration = end_time - start_time
-        total_seconds = int(duration.total_seconds())
-        hours = total_seconds // 3600
-        minutes = (total_seconds % 3600) // 60
-        seconds = total_seconds % 60
+        total_seconds = int((end_time - start_time).total_seconds())
+        hours, remainder = divmod(total_seconds, 3600)
+        minutes, seconds = divmod(remainder, 60)
         
         if hours > 0:
             return f"{hours}h {minutes}m {seconds}s"
@@ -44,4 +41,4 @@ def duration_format(start_time, end_time):
             return f"{minutes}m {seconds}s"
         else:
             return f"{seconds}s"
-    return "N/A"
\ No newline at end of file
+    return "N/A"
@@ -0,0 +1,68 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from authentication.models import User
+from .models import Course, Exam, ExamSession, UserExam
+
+
+class CompletionStateTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('10000000000001', 'Student')
+        course = Course.objects.create(course_name='Python')
+        self.exam = Exam.objects.create(course=course, exam_title='Basics', time_limit=30)
+        self.user_exam = UserExam.objects.create(
+            user=self.user, exam=self.exam, due_date=timezone.now() + timedelta(days=1), attempts_allowed=2
+        )
+
+    def start(self):
+        return ExamSession.objects.create(user_exam=self.user_exam, user=self.user, exam=self.exam)
+
+    def assert_state(self, state):
+        self.user_exam.refresh_from_db()
+        self.assertEqual(self.user_exam.completion_state, state)
+        self.assertEqual(self.user_exam.status, state)
+
+    def test_assign_start_submit(self):
+        self.assert_state('not_started')
+        session = self.start()
+        self.assert_state('in_progress')
+        session.is_submitted = True
+        session.end_time = timezone.now()
+        session.save()
+        self.assert_state('completed')
+        self.assertQuerySetEqual(UserExam.objects.filter(completion_state='completed'), [self.user_exam])
+
+    def test_later_attempt_keeps_completed(self):
+        session = self.start()
+        session.is_submitted = True
+        session.save()
+        self.start()
+        self.assert_state('completed')
+
+    def test_reopening_the_only_submission(self):
+        session = self.start()
+        session.is_submitted = True
+        session.save()
+        session.is_submitted = False
+        session.save()
+        self.assert_state('in_progress')
+
+    def test_deleting_sessions(self):
+        submitted = self.start()
+        submitted.is_submitted = True
+        submitted.save()
+        open_session = self.start()
+        submitted.delete()
+        self.assert_state('in_progress')
+        open_session.delete()
+        self.assert_state('not_started')
+
+    def test_refresh_repairs_a_stale_column(self):
+        # Queryset updates bypass the signals
+        session = self.start()
+        ExamSession.objects.filter(pk=session.pk).update(is_submitted=True)
+        self.assert_state('in_progress')
+        self.assertEqual(self.user_exam.refresh_completion_state(), 'completed')
+        self.assert_state('completed')